@@ -13,11 +13,19 @@ Features:
 
 import streamlit as st
 import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
-from datetime import datetime, timedelta
+import pyarrow as pa
+from datetime import date, datetime, timedelta
+from operator import itemgetter
 import database as db
 
+# Storage locations offered by the inventory forms
+LOCATIONS = ("Pantry", "Refrigerator", "Freezer", "Cabinet", "Other")
+LOCATION_INDEX = {loc: i for i, loc in enumerate(LOCATIONS)}
+LOCATION_FILTERS = ("All Locations",) + LOCATIONS
+
+# Rows per page in the product browser
+PRODUCTS_PAGE_SIZE = 50
+
 # Page configuration
 st.set_page_config(
     page_title="Weekly Grocery Management System",
@@ -27,7 +35,7 @@ st.set_page_config(
 )
 
 # Custom CSS for better styling
-st.markdown("""
+_CSS = """
 <style>
     .main-header {
         font-size: 2.5rem;
@@ -36,32 +44,20 @@ st.markdown("""
         text-align: center;
         padding: 1rem;
     }
-    .metric-card {
-        background-color: #f0f2f6;
-        border-radius: 10px;
-        padding: 1rem;
-        text-align: center;
-    }
-    .success-message {
-        padding: 1rem;
-        background-color: #d4edda;
-        border-radius: 5px;
-        color: #155724;
-    }
-    .warning-message {
-        padding: 1rem;
-        background-color: #fff3cd;
-        border-radius: 5px;
-        color: #856404;
-    }
     .stButton>button {
         width: 100%;
     }
 </style>
-""", unsafe_allow_html=True)
+"""
+st.markdown(_CSS, unsafe_allow_html=True)
+
+# Initialize database once per server process rather than on every script rerun
+@st.cache_resource(show_spinner=False)
+def _init_database():
+    db.init_database()
+    return True
 
-# Initialize database
-db.init_database()
+_init_database()
 
 # Session state initialization
 if 'logged_in' not in st.session_state:
@@ -73,6 +69,120 @@ if 'username' not in st.session_state:
 if 'current_order_id' not in st.session_state:
     st.session_state.current_order_id = None
 
+# ==================== CACHED QUERIES ====================
+
+@st.cache_data(ttl=30, show_spinner=False)
+def _dashboard_bundle(user_id):
+    """Fetch all dashboard data in one round trip, cached per user"""
+    return db.get_dashboard_bundle(user_id)
+
+@st.cache_data(ttl=300, show_spinner=False)
+def _all_products_cached():
+    """Get all products as plain dicts, cached across reruns"""
+    return db.get_all_products()
+
+@st.cache_data(ttl=300, show_spinner=False)
+def _products_by_id_cached():
+    """Get the product_id -> product mapping for the catalogue"""
+    return {p['product_id']: p for p in _all_products_cached()}
+
+@st.cache_data(ttl=300, show_spinner=False)
+def _all_categories_cached():
+    """Get all categories as plain dicts, cached across reruns"""
+    return db.get_all_categories()
+
+@st.cache_data(ttl=300, show_spinner=False)
+def _product_options_cached():
+    """Get the product selectbox label -> product_id mapping"""
+    return {
+        f"{p['product_name']} - {p['brand']} (${p['unit_price']})": p['product_id']
+        for p in _all_products_cached()
+    }
+
+@st.cache_data(ttl=600, show_spinner=False)
+def _inventory_product_options_cached():
+    """Get the "name - brand" label -> product_id mapping for the add-to-inventory form"""
+    return {f"{p['product_name']} - {p['brand']}": p['product_id'] for p in _all_products_cached()}
+
+@st.cache_data(ttl=300, show_spinner=False)
+def _shopping_lists_cached(user_id):
+    """Get a user's shopping lists with item counts, cached across reruns"""
+    return db.get_user_shopping_lists(user_id)
+
+@st.cache_data(ttl=300, show_spinner=False)
+def _shopping_list_items_cached(list_id):
+    """Get the items of one shopping list, cached across reruns"""
+    return db.get_shopping_list_items(list_id)
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _inventory_cached(user_id, name_like=None, location=None):
+    """Get a user's in-stock inventory matching the given filters, cached across reruns"""
+    return db.get_user_inventory(user_id, name_like, location)
+
+@st.cache_data(ttl=30, show_spinner=False)
+def _inventory_bundle(user_id):
+    """Get the inventory summary and alert lists for a user from a single query"""
+    rows = db.get_inventory_alert_rows(user_id)
+    by_expiry = sorted((r for r in rows if r['expiry_date']), key=itemgetter('expiry_date'))
+    return {
+        'summary': {
+            'total_items': len(rows),
+            'total_quantity': sum(r['quantity'] for r in rows),
+            'low_stock_count': sum(1 for r in rows if r['is_low_stock']),
+            'out_of_stock_count': sum(1 for r in rows if r['quantity'] == 0),
+            'expiring_soon_count': sum(1 for r in rows if r['is_expiring_soon']),
+            'expired_count': sum(1 for r in rows if r['is_expired']),
+        },
+        'expired': [r for r in by_expiry if r['is_expired'] and r['quantity'] > 0],
+        'expiring': [r for r in by_expiry if r['is_expiring_soon'] and r['quantity'] > 0],
+        'low_stock': sorted((r for r in rows if r['is_low_stock']),
+                            key=itemgetter('quantity')),
+        'out_of_stock': [r for r in rows if r['quantity'] == 0],
+    }
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _top_products_cached(user_id, limit):
+    """Get a user's most purchased products, cached across reruns"""
+    return db.get_most_purchased_products(user_id, limit=limit)
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _reports_bundle(user_id, start_date, end_date):
+    """Get category, monthly and last-7-days spending for the reports page from one query"""
+    return db.get_reports_bundle(user_id, start_date, end_date)
+
+# Caches to clear when each kind of data changes
+_CACHE_DEPENDENCIES = {
+    'products': (_all_products_cached, _products_by_id_cached, _product_options_cached,
+                 _inventory_product_options_cached, _shopping_list_items_cached,
+                 _inventory_cached, _inventory_bundle, _top_products_cached,
+                 _reports_bundle, _dashboard_bundle),
+    'categories': (_all_categories_cached, _all_products_cached, _products_by_id_cached,
+                   _shopping_list_items_cached, _inventory_cached, _inventory_bundle,
+                   _top_products_cached, _reports_bundle, _dashboard_bundle),
+    'orders': (_top_products_cached, _reports_bundle, _dashboard_bundle),
+    'inventory': (_inventory_cached, _inventory_bundle, _dashboard_bundle),
+    'lists': (_shopping_lists_cached, _shopping_list_items_cached),
+}
+
+def _invalidate(*domains):
+    """Clear every cached query that depends on the given kinds of data"""
+    for domain in domains:
+        for cached in _CACHE_DEPENDENCIES[domain]:
+            cached.clear()
+
+# ==================== DISPLAY HELPERS ====================
+
+def _display_frame(rows, columns):
+    """Build an Arrow-backed DataFrame holding only the given {field: label} columns of rows"""
+    table = pa.Table.from_pydict({
+        label: [row[field] for row in rows] for field, label in columns.items()
+    })
+    return table.to_pandas(types_mapper=pd.ArrowDtype)
+
+def _static_table(df):
+    """Render a short, fixed table as static HTML (no grid component) without the row index"""
+    st.table(df.style.hide(axis='index'))
+
 # ==================== AUTHENTICATION ====================
 
 def show_login_page():
@@ -133,37 +243,134 @@ def show_login_page():
         st.info("🎯 **Demo Account**: Use `demo_user` / `password123` to explore the system")
         if st.button("Load Sample Data", use_container_width=True):
             db.insert_sample_data()
+            _invalidate('products', 'categories', 'orders', 'inventory', 'lists')
             st.success("Sample data loaded!")
 
 # ==================== DASHBOARD ====================
 
-def show_dashboard():
-    """Display main dashboard with analytics"""
-    st.markdown("## 📊 Dashboard")
-    
-    # Get user statistics
-    spending = db.get_total_spending(st.session_state.user_id)
-    total_spent = spending['total_spent'] if spending['total_spent'] else 0
-    total_orders = spending['total_orders'] if spending['total_orders'] else 0
-    
-    # Get inventory summary
-    inv_summary = db.get_inventory_summary(st.session_state.user_id)
-    
-    # Metrics row
-    col1, col2, col3, col4 = st.columns(4)
-    
-    with col1:
-        st.metric("💰 Total Spent", f"${total_spent:.2f}")
-    with col2:
-        st.metric("📦 Total Orders", total_orders)
-    with col3:
-        avg_order = total_spent / total_orders if total_orders > 0 else 0
-        st.metric("📈 Avg Order Value", f"${avg_order:.2f}")
-    with col4:
-        inventory_count = inv_summary['total_items'] if inv_summary and inv_summary['total_items'] else 0
-        st.metric("🏠 Inventory Items", inventory_count)
-    
-    st.divider()
+# Each chart is a fragment, so reruns scoped to one chart never rebuild the others.
+# Figures are built by cached functions keyed on the plotted values, so a rerun
+# with unchanged data reuses the built figure instead of calling Plotly again.
+
+@st.cache_data(ttl=300, show_spinner=False)
+def _inventory_by_location_fig(locations, quantities):
+    """Build the inventory-by-location donut"""
+    import plotly.express as px
+    fig = px.pie(values=quantities, names=locations,
+                hole=0.4, color_discrete_sequence=px.colors.qualitative.Pastel)
+    return fig.to_dict()
+
+@st.fragment
+def _inventory_by_location_chart(user_id):
+    """Pie chart of inventory quantity per storage location"""
+    st.subheader("📍 Inventory by Location")
+    inv_by_location = _dashboard_bundle(user_id)['inv_by_location']
+    if inv_by_location:
+        locations, quantities = zip(*[(r['location'], r['total_quantity']) for r in inv_by_location])
+        st.plotly_chart(_inventory_by_location_fig(locations, quantities), use_container_width=True)
+    else:
+        st.info("No inventory data yet. Add items to your inventory!")
+
+@st.cache_data(ttl=300, show_spinner=False)
+def _inventory_by_category_fig(categories, quantities, item_counts):
+    """Build the inventory-by-category bar chart"""
+    import plotly.express as px
+    fig = px.bar(x=categories, y=quantities, color=item_counts, text=quantities,
+                labels={'x': 'Category', 'y': 'Total Qty', 'color': 'Items'})
+    fig.update_traces(textposition='outside')
+    return fig.to_dict()
+
+@st.fragment
+def _inventory_by_category_chart(user_id):
+    """Bar chart of inventory quantity per category"""
+    st.subheader("📦 Inventory by Category")
+    inv_by_category = _dashboard_bundle(user_id)['inv_by_category']
+    if inv_by_category:
+        categories, quantities, item_counts = zip(*[
+            (r['category_name'], r['total_quantity'], r['item_count']) for r in inv_by_category
+        ])
+        st.plotly_chart(_inventory_by_category_fig(categories, quantities, item_counts),
+                        use_container_width=True)
+    else:
+        st.info("No inventory data yet.")
+
+@st.cache_data(ttl=300, show_spinner=False)
+def _spending_by_category_fig(categories, totals):
+    """Build the dashboard's spending-by-category donut"""
+    import plotly.express as px
+    fig = px.pie(values=totals, names=categories,
+                hole=0.4, color_discrete_sequence=px.colors.qualitative.Set3)
+    fig.update_traces(textposition='inside', textinfo='percent+label')
+    return fig.to_dict()
+
+@st.fragment
+def _spending_by_category_chart(user_id):
+    """Pie chart of completed-order spending per category"""
+    st.subheader("📊 Spending by Category")
+    category_spending = _dashboard_bundle(user_id)['spending_by_category']
+    if category_spending:
+        categories, totals = zip(*[(r['category_name'], r['total_spent']) for r in category_spending])
+        st.plotly_chart(_spending_by_category_fig(categories, totals), use_container_width=True)
+    else:
+        st.info("No spending data yet. Start shopping to see analytics!")
+
+@st.cache_data(ttl=300, show_spinner=False)
+def _monthly_spending_fig(months, totals):
+    """Build the dashboard's monthly spending line"""
+    import plotly.graph_objects as go
+    fig = go.Figure(go.Scattergl(x=months, y=totals, mode='lines+markers'))
+    fig.update_layout(xaxis_title='Month', yaxis_title='Amount ($)', xaxis_tickangle=-45)
+    return fig.to_dict()
+
+@st.fragment
+def _monthly_spending_chart(user_id):
+    """Line chart of monthly spending"""
+    st.subheader("📅 Monthly Spending Trend")
+    monthly_spending = _dashboard_bundle(user_id)['monthly_spending']
+    if monthly_spending['month']:
+        st.plotly_chart(_monthly_spending_fig(monthly_spending['month'], monthly_spending['total_spent']),
+                        use_container_width=True)
+    else:
+        st.info("No monthly data yet.")
+
+@st.cache_data(ttl=300, show_spinner=False)
+def _top_products_fig(bars):
+    """Build the most-purchased bar chart from (product, category, quantity) tuples"""
+    import plotly.graph_objects as go
+    # One bar trace per category keeps the colour legend of the old px.bar
+    fig = go.Figure()
+    for category in dict.fromkeys(bar[1] for bar in bars):
+        rows = [bar for bar in bars if bar[1] == category]
+        fig.add_trace(go.Bar(
+            x=[row[0] for row in rows],
+            y=[row[2] for row in rows],
+            text=[row[2] for row in rows],
+            name=category
+        ))
+    fig.update_traces(textposition='outside')
+    fig.update_layout(
+        xaxis=dict(title='Product', categoryorder='array',
+                   categoryarray=[bar[0] for bar in bars]),
+        yaxis_title='Quantity',
+        legend_title_text='Category'
+    )
+    return fig.to_dict()
+
+@st.fragment
+def _top_products_chart(user_id):
+    """Bar chart of the most purchased products"""
+    st.subheader("🏆 Most Purchased Products")
+    top_products = _dashboard_bundle(user_id)['top_products']
+    if top_products:
+        bars = tuple((r['product_name'], r['category_name'], r['total_quantity']) for r in top_products)
+        st.plotly_chart(_top_products_fig(bars), use_container_width=True)
+    else:
+        st.info("No purchase history yet.")
+
+@st.fragment(run_every=60)
+def _alerts_fragment(user_id):
+    """Expiry, low stock and out of stock alerts, refreshed on their own schedule"""
+    bundle = _dashboard_bundle(user_id)
     
     # Alerts Section - Expiring, Low Stock, Out of Stock
     st.markdown("### ⚠️ Alerts & Notifications")
@@ -172,20 +379,20 @@ def show_dashboard():
     
     # Items Expiring Soon (Within 7 Days)
     with alert_col1:
-        expiring_items = db.get_expiring_soon(st.session_state.user_id, days=7)
-        expired_items = db.get_expired_items(st.session_state.user_id)
+        expiring_items = bundle['expiring']
+        expired_items = bundle['expired']
         
         if expired_items:
-            st.error(f"🚨 **{len(expired_items)} Expired Items**")
-            for item in expired_items[:5]:
+            st.error(f"🚨 **{expired_items[0]['total_count']} Expired Items**")
+            for item in expired_items:
                 days_exp = int(item['days_expired']) if item['days_expired'] else 0
                 st.markdown(f"- ❌ **{item['product_name']}** - Expired {days_exp} days ago")
-            if len(expired_items) > 5:
-                st.caption(f"... and {len(expired_items) - 5} more")
+            if expired_items[0]['total_count'] > len(expired_items):
+                st.caption(f"... and {expired_items[0]['total_count'] - len(expired_items)} more")
         
         if expiring_items:
-            st.warning(f"⏰ **{len(expiring_items)} Items Expiring Soon**")
-            for item in expiring_items[:5]:
+            st.warning(f"⏰ **{expiring_items[0]['total_count']} Items Expiring Soon**")
+            for item in expiring_items:
                 days_left = int(item['days_until_expiry']) if item['days_until_expiry'] else 0
                 if days_left == 0:
                     st.markdown(f"- 🔴 **{item['product_name']}** - Expires TODAY!")
@@ -193,160 +400,190 @@ def show_dashboard():
                     st.markdown(f"- 🟠 **{item['product_name']}** - Expires tomorrow")
                 else:
                     st.markdown(f"- 🟡 **{item['product_name']}** - {days_left} days left")
-            if len(expiring_items) > 5:
-                st.caption(f"... and {len(expiring_items) - 5} more")
+            if expiring_items[0]['total_count'] > len(expiring_items):
+                st.caption(f"... and {expiring_items[0]['total_count'] - len(expiring_items)} more")
         
         if not expired_items and not expiring_items:
             st.success("✅ No items expiring soon!")
     
     # Low Stock Items
     with alert_col2:
-        low_stock = db.get_low_stock_items(st.session_state.user_id)
+        low_stock = bundle['low_stock']
         
         if low_stock:
-            st.warning(f"📉 **{len(low_stock)} Items Running Low**")
-            for item in low_stock[:5]:
+            st.warning(f"📉 **{low_stock[0]['total_count']} Items Running Low**")
+            for item in low_stock:
                 st.markdown(f"- **{item['product_name']}** - Only {item['quantity']} {item['unit_measure']} left")
-            if len(low_stock) > 5:
-                st.caption(f"... and {len(low_stock) - 5} more")
+            if low_stock[0]['total_count'] > len(low_stock):
+                st.caption(f"... and {low_stock[0]['total_count'] - len(low_stock)} more")
         else:
             st.success("✅ All items well stocked!")
     
     # Out of Stock Items
     with alert_col3:
-        out_of_stock = db.get_out_of_stock_items(st.session_state.user_id)
+        out_of_stock = bundle['out_of_stock']
         
         if out_of_stock:
-            st.error(f"🚫 **{len(out_of_stock)} Items Out of Stock**")
-            for item in out_of_stock[:5]:
+            st.error(f"🚫 **{out_of_stock[0]['total_count']} Items Out of Stock**")
+            for item in out_of_stock:
                 st.markdown(f"- **{item['product_name']}** ({item['brand']})")
-            if len(out_of_stock) > 5:
-                st.caption(f"... and {len(out_of_stock) - 5} more")
+            if out_of_stock[0]['total_count'] > len(out_of_stock):
+                st.caption(f"... and {out_of_stock[0]['total_count'] - len(out_of_stock)} more")
         else:
             st.success("✅ Nothing out of stock!")
+
+def show_dashboard():
+    """Display main dashboard with analytics"""
+    st.markdown("## 📊 Dashboard")
     
-    st.divider()
+    # Get all dashboard data (cached per user)
+    bundle = _dashboard_bundle(st.session_state.user_id)
     
-    # Current Inventory Overview
-    st.markdown("### 🏠 Current Inventory Overview")
+    # Get user statistics
+    spending = bundle['spending']
+    total_spent = spending['total_spent'] if spending['total_spent'] else 0
+    total_orders = spending['total_orders'] if spending['total_orders'] else 0
     
-    inv_col1, inv_col2 = st.columns(2)
+    # Get inventory summary
+    inv_summary = bundle['inventory_summary']
     
-    with inv_col1:
-        st.subheader("📍 Inventory by Location")
-        inv_by_location = db.get_inventory_by_location(st.session_state.user_id)
-        if inv_by_location:
-            df = pd.DataFrame([dict(row) for row in inv_by_location])
-            fig = px.pie(df, values='total_quantity', names='location',
-                        hole=0.4, color_discrete_sequence=px.colors.qualitative.Pastel)
-            st.plotly_chart(fig, use_container_width=True)
-        else:
-            st.info("No inventory data yet. Add items to your inventory!")
-    
-    with inv_col2:
-        st.subheader("📦 Inventory by Category")
-        inv_by_category = db.get_inventory_by_category(st.session_state.user_id)
-        if inv_by_category:
-            df = pd.DataFrame([dict(row) for row in inv_by_category])
-            fig = px.bar(df, x='category_name', y='total_quantity',
-                        color='item_count', text='total_quantity',
-                        labels={'category_name': 'Category', 'total_quantity': 'Total Qty', 'item_count': 'Items'})
-            fig.update_traces(textposition='outside')
-            st.plotly_chart(fig, use_container_width=True)
-        else:
-            st.info("No inventory data yet.")
+    # Metrics row
+    col1, col2, col3, col4 = st.columns(4)
+    
+    with col1:
+        st.metric("💰 Total Spent", f"${total_spent:.2f}")
+    with col2:
+        st.metric("📦 Total Orders", total_orders)
+    with col3:
+        avg_order = spending['avg_order'] or 0
+        st.metric("📈 Avg Order Value", f"${avg_order:.2f}")
+    with col4:
+        inventory_count = inv_summary['total_items'] if inv_summary and inv_summary['total_items'] else 0
+        st.metric("🏠 Inventory Items", inventory_count)
     
     st.divider()
     
-    # Charts row
-    col1, col2 = st.columns(2)
+    # Section selector - only the selected section builds its tables and charts
+    section = st.radio(
+        "Dashboard Section",
+        ["⚠️ Alerts", "🏠 Inventory", "📊 Spending", "📅 Trends", "💡 Suggestions"],
+        horizontal=True,
+        label_visibility="collapsed",
+        key="dashboard_section"
+    )
     
-    with col1:
-        st.subheader("📊 Spending by Category")
-        category_spending = db.get_spending_by_category(st.session_state.user_id)
-        if category_spending:
-            df = pd.DataFrame([dict(row) for row in category_spending])
-            fig = px.pie(df, values='total_spent', names='category_name', 
-                        hole=0.4, color_discrete_sequence=px.colors.qualitative.Set3)
-            fig.update_traces(textposition='inside', textinfo='percent+label')
-            st.plotly_chart(fig, use_container_width=True)
-        else:
-            st.info("No spending data yet. Start shopping to see analytics!")
+    if section == "⚠️ Alerts":
+        _alerts_fragment(st.session_state.user_id)
     
-    with col2:
-        st.subheader("📅 Monthly Spending Trend")
-        monthly_spending = db.get_monthly_spending(st.session_state.user_id)
-        if monthly_spending:
-            df = pd.DataFrame([dict(row) for row in monthly_spending])
-            fig = px.line(df, x='month', y='total_spent', markers=True,
-                         labels={'month': 'Month', 'total_spent': 'Amount ($)'})
-            fig.update_layout(xaxis_tickangle=-45)
-            st.plotly_chart(fig, use_container_width=True)
-        else:
-            st.info("No monthly data yet.")
+    elif section == "🏠 Inventory":
+        # Current Inventory Overview
+        st.markdown("### 🏠 Current Inventory Overview")
+        
+        inv_col1, inv_col2 = st.columns(2)
+        
+        with inv_col1:
+            _inventory_by_location_chart(st.session_state.user_id)
+        
+        with inv_col2:
+            _inventory_by_category_chart(st.session_state.user_id)
     
-    # Most purchased products
-    st.subheader("🏆 Most Purchased Products")
-    top_products = db.get_most_purchased_products(st.session_state.user_id, limit=5)
-    if top_products:
-        df = pd.DataFrame([dict(row) for row in top_products])
-        fig = px.bar(df, x='product_name', y='total_quantity', 
-                    color='category_name', text='total_quantity',
-                    labels={'product_name': 'Product', 'total_quantity': 'Quantity'})
-        fig.update_traces(textposition='outside')
-        st.plotly_chart(fig, use_container_width=True)
-    else:
-        st.info("No purchase history yet.")
+    elif section == "📊 Spending":
+        _spending_by_category_chart(st.session_state.user_id)
     
-    # Product suggestions
-    st.subheader("💡 Suggested Products")
-    suggestions = db.get_suggested_products(st.session_state.user_id, limit=5)
-    if suggestions:
-        cols = st.columns(5)
-        for i, product in enumerate(suggestions):
-            with cols[i % 5]:
-                st.markdown(f"""
-                **{product['product_name']}**  
-                {product['brand']}  
-                ${product['unit_price']:.2f}
-                """)
-    else:
-        st.info("Shop more to get personalized suggestions!")
+    elif section == "📅 Trends":
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            _monthly_spending_chart(st.session_state.user_id)
+        
+        with col2:
+            _top_products_chart(st.session_state.user_id)
+    
+    elif section == "💡 Suggestions":
+        # Product suggestions
+        st.subheader("💡 Suggested Products")
+        suggestions = bundle['suggestions']
+        if suggestions:
+            cols = st.columns(5)
+            for i, product in enumerate(suggestions):
+                with cols[i % 5]:
+                    st.markdown(f"""
+                    **{product['product_name']}**  
+                    {product['brand']}  
+                    ${product['unit_price']:.2f}
+                    """)
+        else:
+            st.info("Shop more to get personalized suggestions!")
 
 # ==================== PRODUCTS MANAGEMENT ====================
 
+def _reset_product_page():
+    """Return the product browser to its first page when its filters change"""
+    st.session_state.product_page = 1
+
+def _browse_products(search, category_id, page):
+    """Get one page of the product browser; filters, ordering and paging all run in SQL"""
+    return db.get_products_for_browse(
+        search_term=search or None,
+        category_id=category_id,
+        limit=PRODUCTS_PAGE_SIZE,
+        offset=(page - 1) * PRODUCTS_PAGE_SIZE
+    )
+
 def show_products_page():
     """Display products management page"""
     st.markdown("## 📦 Product Management")
     
     tab1, tab2, tab3 = st.tabs(["🔍 Browse Products", "➕ Add Product", "📁 Categories"])
     
+    # Category lookups shared by the browse filter and the edit/add forms
+    categories = _all_categories_cached()
+    cat_name_by_id = {c['category_id']: c['category_name'] for c in categories}
+    cat_index_by_id = {c['category_id']: i for i, c in enumerate(categories)}
+    
     with tab1:
         # Search and filter
-        col1, col2 = st.columns([2, 1])
+        col1, col2, col3 = st.columns([2, 1, 1])
         with col1:
-            search = st.text_input("🔍 Search products", placeholder="Search by name or brand...")
+            search = st.text_input("🔍 Search products", placeholder="Search by name or brand...",
+                                   on_change=_reset_product_page)
         with col2:
-            categories = db.get_all_categories()
-            category_options = ["All Categories"] + [c['category_name'] for c in categories]
-            selected_category = st.selectbox("Filter by Category", category_options)
+            filter_labels = {None: "All Categories", **cat_name_by_id}
+            selected_category_id = st.selectbox(
+                "Filter by Category",
+                list(filter_labels),
+                format_func=filter_labels.get,
+                on_change=_reset_product_page
+            )
         
-        # Get products
-        if search:
-            products = db.search_products(search)
-        elif selected_category != "All Categories":
-            cat = next((c for c in categories if c['category_name'] == selected_category), None)
-            products = db.get_products_by_category(cat['category_id']) if cat else []
-        else:
-            products = db.get_all_products()
+        # Get the requested page; if the results shrank below it (e.g. products
+        # were deleted), fall back to the last page that still has products
+        page = st.session_state.get('product_page', 1)
+        products = _browse_products(search, selected_category_id, page)
+        if not products and page > 1:
+            first_page = _browse_products(search, selected_category_id, 1)
+            page = -(-first_page[0]['total_count'] // PRODUCTS_PAGE_SIZE) if first_page else 1
+            products = _browse_products(search, selected_category_id, page) if page > 1 else first_page
+        total_pages = max(1, -(-products[0]['total_count'] // PRODUCTS_PAGE_SIZE)) if products else 1
+        
+        if st.session_state.get('product_page') != page:
+            st.session_state.product_page = page
+        with col3:
+            page = st.number_input("Page", min_value=1, max_value=total_pages, key="product_page")
         
         # Display products in a table
         if products:
-            df = pd.DataFrame([dict(row) for row in products])
-            df = df[['product_id', 'product_name', 'brand', 'category_name', 'unit_price', 'unit_measure']]
-            df.columns = ['ID', 'Product Name', 'Brand', 'Category', 'Price ($)', 'Unit']
-            
-            st.dataframe(df, use_container_width=True, hide_index=True)
+            st.dataframe(
+                products,
+                column_config={
+                    'product_id': 'ID', 'product_name': 'Product Name', 'brand': 'Brand',
+                    'category_name': 'Category', 'unit_price': 'Price ($)', 'unit_measure': 'Unit',
+                    'total_count': None
+                },
+                use_container_width=True,
+                hide_index=True
+            )
+            st.caption(f"Page {page} of {total_pages} ({products[0]['total_count']} products)")
             
             # Edit/Delete product
             st.subheader("Edit Product")
@@ -355,7 +592,7 @@ def show_products_page():
             
             if selected_product:
                 product_id = product_options[selected_product]
-                product = db.get_product_by_id(product_id)
+                product = _products_by_id_cached().get(product_id) or db.get_product_by_id(product_id)
                 
                 col1, col2 = st.columns(2)
                 with col1:
@@ -363,9 +600,9 @@ def show_products_page():
                     edit_brand = st.text_input("Brand", value=product['brand'] or '')
                     edit_category = st.selectbox(
                         "Category", 
-                        [c['category_id'] for c in categories],
-                        format_func=lambda x: next(c['category_name'] for c in categories if c['category_id'] == x),
-                        index=next(i for i, c in enumerate(categories) if c['category_id'] == product['category_id'])
+                        list(cat_name_by_id),
+                        format_func=cat_name_by_id.get,
+                        index=cat_index_by_id[product['category_id']]
                     )
                 with col2:
                     edit_price = st.number_input("Unit Price ($)", value=float(product['unit_price']), min_value=0.01)
@@ -375,12 +612,14 @@ def show_products_page():
                 with col1:
                     if st.button("💾 Update Product", use_container_width=True):
                         db.update_product(product_id, edit_name, edit_category, edit_price, edit_brand, edit_unit)
+                        _invalidate('products')
                         st.success("Product updated!")
                         st.rerun()
                 with col2:
                     if st.button("🗑️ Delete Product", use_container_width=True, type="secondary"):
                         try:
                             db.delete_product(product_id)
+                            _invalidate('products')
                             st.success("Product deleted!")
                             st.rerun()
                         except Exception as e:
@@ -390,7 +629,6 @@ def show_products_page():
     
     with tab2:
         st.subheader("Add New Product")
-        categories = db.get_all_categories()
         
         if not categories:
             st.warning("Please create categories first!")
@@ -402,8 +640,8 @@ def show_products_page():
                     brand = st.text_input("Brand")
                     category_id = st.selectbox(
                         "Category*",
-                        [c['category_id'] for c in categories],
-                        format_func=lambda x: next(c['category_name'] for c in categories if c['category_id'] == x)
+                        list(cat_name_by_id),
+                        format_func=cat_name_by_id.get
                     )
                 with col2:
                     unit_price = st.number_input("Unit Price ($)*", min_value=0.01, value=1.00)
@@ -412,6 +650,7 @@ def show_products_page():
                 if st.form_submit_button("➕ Add Product", use_container_width=True):
                     if product_name:
                         db.create_product(product_name, category_id, unit_price, brand, unit_measure)
+                        _invalidate('products')
                         st.success(f"Product '{product_name}' added successfully!")
                         st.rerun()
                     else:
@@ -421,10 +660,11 @@ def show_products_page():
         st.subheader("Manage Categories")
         
         # Display existing categories
-        categories = db.get_all_categories()
         if categories:
-            df = pd.DataFrame([dict(row) for row in categories])
-            st.dataframe(df, use_container_width=True, hide_index=True)
+            df = _display_frame(categories, {
+                'category_id': 'category_id', 'category_name': 'category_name', 'description': 'description'
+            })
+            _static_table(df)
         
         # Add new category
         st.subheader("Add New Category")
@@ -436,6 +676,7 @@ def show_products_page():
                 if cat_name:
                     try:
                         db.create_category(cat_name, cat_desc)
+                        _invalidate('categories')
                         st.success(f"Category '{cat_name}' added!")
                         st.rerun()
                     except ValueError as e:
@@ -445,6 +686,87 @@ def show_products_page():
 
 # ==================== SHOPPING LISTS ====================
 
+def _save_purchased_items(list_id, items):
+    """Form callback: save the purchased flag of items whose checkbox changed"""
+    edited_rows = st.session_state[f"items_{list_id}"]['edited_rows']
+    changes = [
+        (items[row]['item_id'], edits['Purchased']) for row, edits in edited_rows.items()
+        if 'Purchased' in edits and edits['Purchased'] != (items[row]['is_purchased'] == 1)
+    ]
+    db.set_items_purchased(changes)
+    # Drop the editor's pending edits so they are not replayed over the saved rows
+    del st.session_state[f"items_{list_id}"]
+    _invalidate('lists')
+
+@st.fragment
+def _shopping_list_fragment(shopping_list, product_options, product_labels):
+    """One shopping list's expander; widget changes inside it rerun only this list"""
+    status = "✅" if not shopping_list['is_active'] else "📝"
+    with st.expander(f"{status} {shopping_list['list_name']} ({shopping_list['total_items'] or 0} items)"):
+        items = _shopping_list_items_cached(shopping_list['list_id'])
+        
+        if items:
+            # Estimated total is aggregated by the items query
+            total = items[0]['list_total']
+            st.metric("Estimated Total", f"${total:.2f}")
+            
+            # Items render as one editable table sorted by category; only the
+            # Purchased column is editable, and the form saves all toggles in one write
+            with st.form(f"list_{shopping_list['list_id']}"):
+                df = _display_frame(items, {
+                    'is_purchased': 'Purchased', 'category_name': 'Category', 'product_name': 'Product',
+                    'brand': 'Brand', 'quantity': 'Qty', 'unit_measure': 'Unit', 'subtotal': 'Subtotal ($)'
+                })
+                df['Purchased'] = df['Purchased'].astype(bool)
+                st.data_editor(
+                    df,
+                    key=f"items_{shopping_list['list_id']}",
+                    disabled=['Category', 'Product', 'Brand', 'Qty', 'Unit', 'Subtotal ($)'],
+                    column_config={'Subtotal ($)': st.column_config.NumberColumn(format="$%.2f")},
+                    use_container_width=True,
+                    hide_index=True
+                )
+                
+                st.form_submit_button(
+                    "💾 Save Purchased Items",
+                    use_container_width=True,
+                    on_click=_save_purchased_items,
+                    args=(shopping_list['list_id'], items)
+                )
+        else:
+            st.info("No items in this list yet")
+        
+        # Add items to list
+        if shopping_list['is_active']:
+            st.divider()
+            col1, col2, col3 = st.columns([2, 1, 1])
+            with col1:
+                selected = st.selectbox("Add product", product_labels, key=f"add_{shopping_list['list_id']}")
+            with col2:
+                qty = st.number_input("Qty", min_value=1, value=1, key=f"qty_{shopping_list['list_id']}")
+            with col3:
+                if st.button("➕ Add", key=f"btn_{shopping_list['list_id']}"):
+                    db.add_item_to_shopping_list(shopping_list['list_id'], product_options[selected], qty)
+                    _invalidate('lists')
+                    st.rerun()
+            
+            # Actions
+            col1, col2 = st.columns(2)
+            with col1:
+                if st.button("🛒 Convert to Order", key=f"convert_{shopping_list['list_id']}", use_container_width=True):
+                    try:
+                        order_id = db.convert_shopping_list_to_order(shopping_list['list_id'], st.session_state.user_id)
+                        _invalidate('orders', 'lists')
+                        st.success(f"Order #{order_id} created!")
+                        st.rerun()
+                    except ValueError as e:
+                        st.error(str(e))
+            with col2:
+                if st.button("🗑️ Delete List", key=f"del_{shopping_list['list_id']}", use_container_width=True, type="secondary"):
+                    db.delete_shopping_list(shopping_list['list_id'])
+                    _invalidate('lists')
+                    st.rerun()
+
 def show_shopping_lists_page():
     """Display shopping lists management page"""
     st.markdown("## 📝 Shopping Lists")
@@ -458,6 +780,7 @@ def show_shopping_lists_page():
             if st.form_submit_button("➕ Create List", use_container_width=True):
                 if list_name:
                     db.create_shopping_list(st.session_state.user_id, list_name)
+                    _invalidate('lists')
                     st.success(f"List '{list_name}' created!")
                     st.rerun()
                 else:
@@ -465,70 +788,15 @@ def show_shopping_lists_page():
     
     with col1:
         st.subheader("Your Shopping Lists")
-        lists = db.get_user_shopping_lists(st.session_state.user_id)
+        lists = _shopping_lists_cached(st.session_state.user_id)
         
         if lists:
+            # Product choices are the same for every list, so build them once per rerun
+            product_options = _product_options_cached()
+            product_labels = list(product_options)
+            
             for shopping_list in lists:
-                status = "✅" if not shopping_list['is_active'] else "📝"
-                with st.expander(f"{status} {shopping_list['list_name']} ({shopping_list['total_items'] or 0} items)"):
-                    items = db.get_shopping_list_items(shopping_list['list_id'])
-                    
-                    if items:
-                        # Calculate estimated total
-                        total = sum(item['unit_price'] * item['quantity'] for item in items)
-                        st.metric("Estimated Total", f"${total:.2f}")
-                        
-                        # Display items grouped by category
-                        df = pd.DataFrame([dict(item) for item in items])
-                        
-                        for cat in df['category_name'].unique():
-                            st.markdown(f"**{cat}**")
-                            cat_items = df[df['category_name'] == cat]
-                            for _, item in cat_items.iterrows():
-                                col1, col2, col3 = st.columns([3, 1, 1])
-                                with col1:
-                                    checked = item['is_purchased'] == 1
-                                    st.checkbox(
-                                        f"{item['product_name']} ({item['brand']}) - {item['quantity']} {item['unit_measure']}",
-                                        value=checked,
-                                        key=f"item_{item['item_id']}",
-                                        on_change=lambda id=item['item_id']: db.toggle_shopping_list_item(id)
-                                    )
-                                with col2:
-                                    st.write(f"${item['unit_price'] * item['quantity']:.2f}")
-                    else:
-                        st.info("No items in this list yet")
-                    
-                    # Add items to list
-                    if shopping_list['is_active']:
-                        st.divider()
-                        products = db.get_all_products()
-                        product_options = {f"{p['product_name']} - {p['brand']} (${p['unit_price']})": p['product_id'] for p in products}
-                        
-                        col1, col2, col3 = st.columns([2, 1, 1])
-                        with col1:
-                            selected = st.selectbox("Add product", list(product_options.keys()), key=f"add_{shopping_list['list_id']}")
-                        with col2:
-                            qty = st.number_input("Qty", min_value=1, value=1, key=f"qty_{shopping_list['list_id']}")
-                        with col3:
-                            if st.button("➕ Add", key=f"btn_{shopping_list['list_id']}"):
-                                db.add_item_to_shopping_list(shopping_list['list_id'], product_options[selected], qty)
-                                st.rerun()
-                        
-                        # Actions
-                        col1, col2 = st.columns(2)
-                        with col1:
-                            if st.button("🛒 Convert to Order", key=f"convert_{shopping_list['list_id']}", use_container_width=True):
-                                try:
-                                    order_id = db.convert_shopping_list_to_order(shopping_list['list_id'], st.session_state.user_id)
-                                    st.success(f"Order #{order_id} created!")
-                                    st.rerun()
-                                except ValueError as e:
-                                    st.error(str(e))
-                        with col2:
-                            if st.button("🗑️ Delete List", key=f"del_{shopping_list['list_id']}", use_container_width=True, type="secondary"):
-                                db.delete_shopping_list(shopping_list['list_id'])
-                                st.rerun()
+                _shopping_list_fragment(shopping_list, product_options, product_labels)
         else:
             st.info("No shopping lists yet. Create one to get started!")
 
@@ -546,16 +814,16 @@ def show_orders_page():
         if orders:
             for order in orders:
                 status_icon = "✅" if order['status'] == 'completed' else "⏳"
-                order_date = datetime.fromisoformat(order['order_date']) if order['order_date'] else datetime.now()
                 
-                with st.expander(f"{status_icon} Order #{order['order_id']} - {order_date.strftime('%Y-%m-%d %H:%M')} - ${order['total_amount']:.2f}"):
+                with st.expander(f"{status_icon} Order #{order['order_id']} - {order['order_date_display']} - ${order['total_amount']:.2f}"):
                     details = db.get_order_details(order['order_id'])
                     
                     if details:
-                        df = pd.DataFrame([dict(d) for d in details])
-                        df = df[['product_name', 'brand', 'category_name', 'quantity', 'unit_price', 'subtotal']]
-                        df.columns = ['Product', 'Brand', 'Category', 'Qty', 'Unit Price ($)', 'Subtotal ($)']
-                        st.dataframe(df, use_container_width=True, hide_index=True)
+                        df = _display_frame(details, {
+                            'product_name': 'Product', 'brand': 'Brand', 'category_name': 'Category',
+                            'quantity': 'Qty', 'unit_price': 'Unit Price ($)', 'subtotal': 'Subtotal ($)'
+                        })
+                        _static_table(df)
                         
                         st.markdown(f"**Total: ${order['total_amount']:.2f}**")
                     
@@ -564,11 +832,13 @@ def show_orders_page():
                         with col1:
                             if st.button("✅ Complete Order", key=f"complete_{order['order_id']}", use_container_width=True):
                                 db.complete_order(order['order_id'])
+                                _invalidate('orders')
                                 st.success("Order completed!")
                                 st.rerun()
                         with col2:
                             if st.button("🗑️ Cancel Order", key=f"cancel_{order['order_id']}", use_container_width=True, type="secondary"):
                                 db.delete_order(order['order_id'])
+                                _invalidate('orders')
                                 st.rerun()
         else:
             st.info("No orders yet. Create a shopping list and convert it to an order!")
@@ -589,15 +859,15 @@ def show_orders_page():
             details = db.get_order_details(st.session_state.current_order_id)
             if details:
                 st.subheader("Order Items")
-                df = pd.DataFrame([dict(d) for d in details])
-                df = df[['product_name', 'brand', 'quantity', 'unit_price', 'subtotal']]
-                df.columns = ['Product', 'Brand', 'Qty', 'Unit Price', 'Subtotal']
-                st.dataframe(df, use_container_width=True, hide_index=True)
+                df = _display_frame(details, {
+                    'product_name': 'Product', 'brand': 'Brand', 'quantity': 'Qty',
+                    'unit_price': 'Unit Price', 'subtotal': 'Subtotal'
+                })
+                _static_table(df)
             
             # Add items
             st.subheader("Add Items")
-            products = db.get_all_products()
-            product_options = {f"{p['product_name']} - {p['brand']} (${p['unit_price']})": p['product_id'] for p in products}
+            product_options = _product_options_cached()
             
             col1, col2, col3 = st.columns([2, 1, 1])
             with col1:
@@ -607,6 +877,7 @@ def show_orders_page():
             with col3:
                 if st.button("➕ Add to Order", use_container_width=True):
                     db.add_order_detail(st.session_state.current_order_id, product_options[selected_product], quantity)
+                    _invalidate('orders')
                     st.rerun()
             
             # Actions
@@ -614,17 +885,70 @@ def show_orders_page():
             with col1:
                 if st.button("✅ Complete Order", use_container_width=True, type="primary"):
                     db.complete_order(st.session_state.current_order_id)
+                    _invalidate('orders')
                     st.session_state.current_order_id = None
                     st.success("Order completed!")
                     st.rerun()
             with col2:
                 if st.button("🗑️ Cancel Order", use_container_width=True, type="secondary"):
                     db.delete_order(st.session_state.current_order_id)
+                    _invalidate('orders')
                     st.session_state.current_order_id = None
                     st.rerun()
 
 # ==================== REPORTS ====================
 
+# Figures are cached on the plotted values, so unrelated reruns reuse the built JSON
+
+@st.cache_data(ttl=300, show_spinner=False)
+def _spending_distribution_fig(categories, totals):
+    """Build the spending distribution pie for the selected period"""
+    import plotly.express as px
+    fig = px.pie(values=totals, names=categories,
+                title='Spending Distribution', hole=0.3)
+    return fig.to_dict()
+
+@st.cache_data(ttl=300, show_spinner=False)
+def _category_spending_bar_fig(categories, totals):
+    """Build the spending by category bar chart for the selected period"""
+    import plotly.express as px
+    fig = px.bar(x=categories, y=totals,
+                title='Spending by Category',
+                labels={'x': 'Category', 'y': 'Amount ($)'})
+    return fig.to_dict()
+
+@st.cache_data(ttl=300, show_spinner=False)
+def _monthly_trend_fig(months, totals, order_counts):
+    """Build the monthly spending and order count chart"""
+    import plotly.graph_objects as go
+    fig = go.Figure()
+    fig.add_trace(go.Scattergl(
+        x=months, y=totals,
+        mode='lines+markers', name='Total Spent',
+        line=dict(color='#1E88E5', width=3)
+    ))
+    fig.add_trace(go.Bar(
+        x=months, y=order_counts,
+        name='Order Count', yaxis='y2',
+        opacity=0.5
+    ))
+    fig.update_layout(
+        title='Monthly Spending and Order Count',
+        yaxis=dict(title='Amount ($)'),
+        yaxis2=dict(title='Orders', overlaying='y', side='right'),
+        hovermode='x unified'
+    )
+    return fig.to_dict()
+
+@st.cache_data(ttl=300, show_spinner=False)
+def _weekly_spending_fig(days, daily_totals):
+    """Build the daily spending bar chart for the last 7 days"""
+    import plotly.express as px
+    fig = px.bar(x=days, y=daily_totals,
+                title='Daily Spending (Last 7 Days)',
+                labels={'x': 'Date', 'y': 'Amount ($)'})
+    return fig.to_dict()
+
 def show_reports_page():
     """Display reports and analytics page"""
     st.markdown("## 📈 Reports & Analytics")
@@ -638,183 +962,247 @@ def show_reports_page():
     
     st.divider()
     
+    report = _reports_bundle(st.session_state.user_id, start_date.isoformat(), end_date.isoformat())
+    
     # Category spending breakdown
     st.subheader("💰 Spending by Category")
-    category_data = db.get_spending_by_category(
-        st.session_state.user_id,
-        start_date.isoformat(),
-        end_date.isoformat()
-    )
+    category_data = report['spending_by_category']
     
     if category_data:
-        df = pd.DataFrame([dict(row) for row in category_data])
+        categories, totals = zip(*[(r['category_name'], r['total_spent']) for r in category_data])
         
         col1, col2 = st.columns(2)
         with col1:
-            fig = px.pie(df, values='total_spent', names='category_name',
-                        title='Spending Distribution', hole=0.3)
-            st.plotly_chart(fig, use_container_width=True)
+            st.plotly_chart(_spending_distribution_fig(categories, totals), use_container_width=True)
         with col2:
-            fig = px.bar(df, x='category_name', y='total_spent',
-                        title='Spending by Category',
-                        labels={'category_name': 'Category', 'total_spent': 'Amount ($)'})
-            st.plotly_chart(fig, use_container_width=True)
+            st.plotly_chart(_category_spending_bar_fig(categories, totals), use_container_width=True)
     else:
         st.info("No spending data for the selected period.")
     
     # Monthly trends
     st.subheader("📅 Monthly Spending Trends")
-    monthly_data = db.get_monthly_spending(st.session_state.user_id)
+    monthly_data = report['monthly_spending']
     
-    if monthly_data:
-        df = pd.DataFrame([dict(row) for row in monthly_data])
-        
-        fig = go.Figure()
-        fig.add_trace(go.Scatter(
-            x=df['month'], y=df['total_spent'],
-            mode='lines+markers', name='Total Spent',
-            line=dict(color='#1E88E5', width=3)
-        ))
-        fig.add_trace(go.Bar(
-            x=df['month'], y=df['order_count'],
-            name='Order Count', yaxis='y2',
-            opacity=0.5
-        ))
-        fig.update_layout(
-            title='Monthly Spending and Order Count',
-            yaxis=dict(title='Amount ($)'),
-            yaxis2=dict(title='Orders', overlaying='y', side='right'),
-            hovermode='x unified'
-        )
+    if monthly_data['month']:
+        fig = _monthly_trend_fig(monthly_data['month'], monthly_data['total_spent'], monthly_data['order_count'])
         st.plotly_chart(fig, use_container_width=True)
     else:
         st.info("No monthly data available.")
     
     # Top products
     st.subheader("🏆 Top 10 Most Purchased Products")
-    top_products = db.get_most_purchased_products(st.session_state.user_id, limit=10)
+    top_products = _top_products_cached(st.session_state.user_id, 10)
     
     if top_products:
-        df = pd.DataFrame([dict(row) for row in top_products])
-        df = df[['product_name', 'brand', 'category_name', 'total_quantity', 'order_count']]
-        df.columns = ['Product', 'Brand', 'Category', 'Total Qty', 'Times Ordered']
-        st.dataframe(df, use_container_width=True, hide_index=True)
+        df = _display_frame(top_products, {
+            'product_name': 'Product', 'brand': 'Brand', 'category_name': 'Category',
+            'total_quantity': 'Total Qty', 'order_count': 'Times Ordered'
+        })
+        df['Category'] = df['Category'].astype('category')
+        _static_table(df)
     else:
         st.info("No purchase data available.")
     
     # Weekly spending summary
     st.subheader("📊 Last 7 Days")
-    weekly_data = db.get_weekly_spending(st.session_state.user_id)
+    weekly_data = report['weekly_spending']
     
-    if weekly_data:
-        df = pd.DataFrame([dict(row) for row in weekly_data])
-        fig = px.bar(df, x='day', y='daily_total',
-                    title='Daily Spending (Last 7 Days)',
-                    labels={'day': 'Date', 'daily_total': 'Amount ($)'})
-        st.plotly_chart(fig, use_container_width=True)
+    if weekly_data['day']:
+        st.plotly_chart(_weekly_spending_fig(weekly_data['day'], weekly_data['daily_total']),
+                        use_container_width=True)
     else:
         st.info("No data for the last 7 days.")
 
 # ==================== INVENTORY MANAGEMENT ====================
 
-def show_inventory_page():
-    """Display inventory management page"""
-    st.markdown("## 🏠 Inventory Management")
-    
-    tab1, tab2, tab3 = st.tabs(["📦 Current Inventory", "➕ Add to Inventory", "⚠️ Alerts"])
-    
-    with tab1:
-        # Filter options
+@st.fragment
+def _inventory_table_fragment(user_id):
+    """Filterable inventory table and edit panel; typing in the filters reruns only this"""
+    # Filter options (applied on submit, so typing does not rerun the query)
+    with st.form("inventory_filter_form"):
         col1, col2 = st.columns([2, 1])
         with col1:
-            search = st.text_input("🔍 Search inventory", placeholder="Search by product name...")
+            search = st.text_input("🔍 Search inventory", placeholder="Search by product name...",
+                                   key="inv_search")
         with col2:
             location_filter = st.selectbox("Filter by Location", 
-                ["All Locations", "Pantry", "Refrigerator", "Freezer", "Cabinet", "Other"])
-        
-        # Get inventory
-        inventory = db.get_user_inventory(st.session_state.user_id)
-        
-        if inventory:
-            # Apply filters
-            filtered_inv = [dict(item) for item in inventory]
-            if search:
-                filtered_inv = [i for i in filtered_inv if search.lower() in i['product_name'].lower()]
-            if location_filter != "All Locations":
-                filtered_inv = [i for i in filtered_inv if i['location'] == location_filter]
+                LOCATION_FILTERS, key="loc_filter")
+        st.form_submit_button("Apply Filters")
+    
+    # Get inventory, filtered in SQL
+    location = location_filter if location_filter != "All Locations" else None
+    filtered_inv = _inventory_cached(user_id, search or None, location)
+    
+    if filtered_inv or search or location:
+        if filtered_inv:
+            # Display as table
+            df_display = _display_frame(filtered_inv, {
+                'product_name': 'Product', 'brand': 'Brand', 'category_name': 'Category',
+                'quantity': 'Qty', 'unit_measure': 'Unit', 'min_quantity': 'Min Qty',
+                'expiry_date': 'Expiry', 'location': 'Location'
+            })
             
-            if filtered_inv:
-                # Display as table
-                df = pd.DataFrame(filtered_inv)
-                display_cols = ['product_name', 'brand', 'category_name', 'quantity', 'unit_measure', 
-                               'min_quantity', 'expiry_date', 'location']
-                df_display = df[display_cols].copy()
-                df_display.columns = ['Product', 'Brand', 'Category', 'Qty', 'Unit', 'Min Qty', 'Expiry', 'Location']
-                
-                st.dataframe(df_display, use_container_width=True, hide_index=True)
-                
-                # Edit inventory item
-                st.subheader("Edit Inventory Item")
-                inv_options = {f"{i['product_name']} ({i['location']})": i['inventory_id'] for i in filtered_inv}
-                selected_inv = st.selectbox("Select item to edit", list(inv_options.keys()))
+            st.dataframe(df_display, use_container_width=True, hide_index=True)
+            
+            # Edit inventory item
+            st.subheader("Edit Inventory Item")
+            inv_by_id = {i['inventory_id']: i for i in filtered_inv}
+            inv_options = dict(zip((f"{i['product_name']} ({i['location']})" for i in filtered_inv), inv_by_id))
+            selected_inv = st.selectbox("Select item to edit", list(inv_options.keys()))
+            
+            if selected_inv:
+                inv_id = inv_options[selected_inv]
+                item = inv_by_id[inv_id]
                 
-                if selected_inv:
-                    inv_id = inv_options[selected_inv]
-                    item = next(i for i in filtered_inv if i['inventory_id'] == inv_id)
-                    
+                with st.form("edit_inventory_form"):
                     col1, col2, col3 = st.columns(3)
                     with col1:
                         new_qty = st.number_input("Quantity", value=item['quantity'], min_value=0)
                         new_min = st.number_input("Min Quantity", value=item['min_quantity'] or 2, min_value=0)
                     with col2:
                         new_expiry = st.date_input("Expiry Date", 
-                            value=datetime.strptime(item['expiry_date'], '%Y-%m-%d').date() if item['expiry_date'] else None)
+                            value=date.fromisoformat(item['expiry_date']) if item['expiry_date'] else None)
                         new_location = st.selectbox("Location", 
-                            ["Pantry", "Refrigerator", "Freezer", "Cabinet", "Other"],
-                            index=["Pantry", "Refrigerator", "Freezer", "Cabinet", "Other"].index(item['location']) if item['location'] in ["Pantry", "Refrigerator", "Freezer", "Cabinet", "Other"] else 0)
+                            LOCATIONS, index=LOCATION_INDEX.get(item['location'], 0), key=f"loc_edit_{inv_id}")
                     with col3:
                         new_notes = st.text_area("Notes", value=item['notes'] or '')
                     
-                    col1, col2, col3 = st.columns(3)
-                    with col1:
-                        if st.button("💾 Update Item", use_container_width=True):
-                            db.update_inventory_item(inv_id, new_qty, new_min, 
-                                new_expiry.isoformat() if new_expiry else None, new_location, new_notes)
-                            st.success("Item updated!")
-                            st.rerun()
-                    with col2:
-                        use_qty = st.number_input("Use quantity", min_value=1, value=1, key="use_qty")
-                    with col3:
-                        if st.button("📉 Use Item", use_container_width=True):
-                            db.use_inventory_item(inv_id, use_qty)
-                            st.success(f"Used {use_qty} {item['unit_measure']}!")
-                            st.rerun()
-                    
-                    if st.button("🗑️ Remove from Inventory", type="secondary"):
-                        db.delete_inventory_item(inv_id)
-                        st.success("Item removed!")
+                    if st.form_submit_button("💾 Update Item", use_container_width=True):
+                        db.update_inventory_item(inv_id, new_qty, new_min, 
+                            new_expiry.isoformat() if new_expiry else None, new_location, new_notes)
+                        _invalidate('inventory')
+                        st.success("Item updated!")
                         st.rerun()
-            else:
-                st.info("No items match your search/filter.")
+                
+                col1, col2 = st.columns(2)
+                with col1:
+                    use_qty = st.number_input("Use quantity", min_value=1, value=1, key="use_qty")
+                with col2:
+                    if st.button("📉 Use Item", use_container_width=True):
+                        db.use_inventory_item(inv_id, use_qty)
+                        _invalidate('inventory')
+                        st.success(f"Used {use_qty} {item['unit_measure']}!")
+                        st.rerun()
+                
+                if st.button("🗑️ Remove from Inventory", type="secondary"):
+                    db.delete_inventory_item(inv_id)
+                    _invalidate('inventory')
+                    st.success("Item removed!")
+                    st.rerun()
         else:
-            st.info("Your inventory is empty. Add items to start tracking!")
+            st.info("No items match your search/filter.")
+    else:
+        st.info("Your inventory is empty. Add items to start tracking!")
+
+@st.fragment
+def _inventory_alerts_fragment(user_id):
+    """Inventory summary metrics and alert tables"""
+    st.subheader("⚠️ Inventory Alerts")
+    
+    # Summary metrics
+    alerts = _inventory_bundle(user_id)
+    inv_summary = alerts['summary']
+    if inv_summary:
+        col1, col2, col3, col4 = st.columns(4)
+        with col1:
+            st.metric("⏰ Expiring Soon", inv_summary['expiring_soon_count'] or 0)
+        with col2:
+            st.metric("❌ Expired", inv_summary['expired_count'] or 0)
+        with col3:
+            st.metric("📉 Low Stock", inv_summary['low_stock_count'] or 0)
+        with col4:
+            st.metric("🚫 Out of Stock", inv_summary['out_of_stock_count'] or 0)
+    
+    st.divider()
+    
+    # Expired Items
+    st.markdown("### ❌ Expired Items")
+    expired = alerts['expired']
+    if expired:
+        df_display = _display_frame(expired, {
+            'product_name': 'Product', 'brand': 'Brand', 'quantity': 'Qty', 'unit_measure': 'Unit',
+            'expiry_date': 'Expiry Date', 'days_expired': 'Days Expired', 'location': 'Location'
+        })
+        df_display['Days Expired'] = pd.to_numeric(df_display['Days Expired'], downcast='integer')
+        st.dataframe(df_display, use_container_width=True, hide_index=True)
+    else:
+        st.success("No expired items! 🎉")
+    
+    # Expiring Soon
+    st.markdown("### ⏰ Expiring Within 7 Days")
+    expiring = alerts['expiring']
+    if expiring:
+        df_display = _display_frame(expiring, {
+            'product_name': 'Product', 'brand': 'Brand', 'quantity': 'Qty', 'unit_measure': 'Unit',
+            'expiry_date': 'Expiry Date', 'days_until_expiry': 'Days Left', 'location': 'Location'
+        })
+        df_display['Days Left'] = pd.to_numeric(df_display['Days Left'], downcast='integer')
+        st.dataframe(df_display, use_container_width=True, hide_index=True)
+    else:
+        st.success("No items expiring soon! 🎉")
+    
+    # Low Stock
+    st.markdown("### 📉 Low Stock Items")
+    low_stock = alerts['low_stock']
+    if low_stock:
+        df_display = _display_frame(low_stock, {
+            'product_name': 'Product', 'brand': 'Brand', 'quantity': 'Current Qty',
+            'min_quantity': 'Min Qty', 'unit_measure': 'Unit', 'location': 'Location'
+        })
+        st.dataframe(df_display, use_container_width=True, hide_index=True)
+        
+        # Quick add to shopping list
+        if st.button("📝 Add All Low Stock Items to Shopping List"):
+            lists = _shopping_lists_cached(user_id)
+            active_lists = [l for l in lists if l['is_active']]
+            restock = [(item['product_id'], item['min_quantity'] - item['quantity'] + 1) for item in low_stock]
+            if active_lists:
+                db.add_items_to_shopping_list(active_lists[0]['list_id'], restock)
+                st.success(f"Added {len(low_stock)} items to '{active_lists[0]['list_name']}'!")
+            else:
+                list_id = db.create_shopping_list(user_id, "Restock List")
+                db.add_items_to_shopping_list(list_id, restock)
+                st.success(f"Created 'Restock List' with {len(low_stock)} items!")
+            _invalidate('lists')
+            st.rerun()
+    else:
+        st.success("All items are well stocked! 🎉")
+    
+    # Out of Stock
+    st.markdown("### 🚫 Out of Stock Items")
+    out_of_stock = alerts['out_of_stock']
+    if out_of_stock:
+        df_display = _display_frame(out_of_stock, {
+            'product_name': 'Product', 'brand': 'Brand', 'category_name': 'Category', 'unit_price': 'Price ($)'
+        })
+        st.dataframe(df_display, use_container_width=True, hide_index=True)
+    else:
+        st.success("Nothing is out of stock! 🎉")
+
+def show_inventory_page():
+    """Display inventory management page"""
+    st.markdown("## 🏠 Inventory Management")
+    
+    tab1, tab2, tab3 = st.tabs(["📦 Current Inventory", "➕ Add to Inventory", "⚠️ Alerts"])
+    
+    with tab1:
+        _inventory_table_fragment(st.session_state.user_id)
     
     with tab2:
         st.subheader("Add Item to Inventory")
         
-        products = db.get_all_products()
-        if products:
+        product_options = _inventory_product_options_cached()
+        if product_options:
             with st.form("add_inventory_form"):
                 col1, col2 = st.columns(2)
                 with col1:
-                    product_options = {f"{p['product_name']} - {p['brand']}": p['product_id'] for p in products}
                     selected_product = st.selectbox("Select Product", list(product_options.keys()))
                     quantity = st.number_input("Quantity", min_value=1, value=1)
                     min_quantity = st.number_input("Minimum Quantity (for low stock alerts)", min_value=0, value=2)
                 with col2:
                     expiry_date = st.date_input("Expiry Date (optional)", value=None)
                     location = st.selectbox("Storage Location", 
-                        ["Pantry", "Refrigerator", "Freezer", "Cabinet", "Other"])
+                        LOCATIONS, key="loc_add")
                     notes = st.text_input("Notes (optional)")
                 
                 if st.form_submit_button("➕ Add to Inventory", use_container_width=True):
@@ -828,89 +1216,14 @@ def show_inventory_page():
                         min_quantity,
                         notes
                     )
+                    _invalidate('inventory')
                     st.success(f"Added {quantity} x {selected_product.split(' - ')[0]} to inventory!")
                     st.rerun()
         else:
             st.warning("No products available. Please add products first!")
     
     with tab3:
-        st.subheader("⚠️ Inventory Alerts")
-        
-        # Summary metrics
-        inv_summary = db.get_inventory_summary(st.session_state.user_id)
-        if inv_summary:
-            col1, col2, col3, col4 = st.columns(4)
-            with col1:
-                st.metric("⏰ Expiring Soon", inv_summary['expiring_soon_count'] or 0)
-            with col2:
-                st.metric("❌ Expired", inv_summary['expired_count'] or 0)
-            with col3:
-                st.metric("📉 Low Stock", inv_summary['low_stock_count'] or 0)
-            with col4:
-                st.metric("🚫 Out of Stock", inv_summary['out_of_stock_count'] or 0)
-        
-        st.divider()
-        
-        # Expired Items
-        st.markdown("### ❌ Expired Items")
-        expired = db.get_expired_items(st.session_state.user_id)
-        if expired:
-            df = pd.DataFrame([dict(i) for i in expired])
-            df['days_expired'] = df['days_expired'].astype(int)
-            df_display = df[['product_name', 'brand', 'quantity', 'unit_measure', 'expiry_date', 'days_expired', 'location']]
-            df_display.columns = ['Product', 'Brand', 'Qty', 'Unit', 'Expiry Date', 'Days Expired', 'Location']
-            st.dataframe(df_display, use_container_width=True, hide_index=True)
-        else:
-            st.success("No expired items! 🎉")
-        
-        # Expiring Soon
-        st.markdown("### ⏰ Expiring Within 7 Days")
-        expiring = db.get_expiring_soon(st.session_state.user_id, days=7)
-        if expiring:
-            df = pd.DataFrame([dict(i) for i in expiring])
-            df['days_until_expiry'] = df['days_until_expiry'].astype(int)
-            df_display = df[['product_name', 'brand', 'quantity', 'unit_measure', 'expiry_date', 'days_until_expiry', 'location']]
-            df_display.columns = ['Product', 'Brand', 'Qty', 'Unit', 'Expiry Date', 'Days Left', 'Location']
-            st.dataframe(df_display, use_container_width=True, hide_index=True)
-        else:
-            st.success("No items expiring soon! 🎉")
-        
-        # Low Stock
-        st.markdown("### 📉 Low Stock Items")
-        low_stock = db.get_low_stock_items(st.session_state.user_id)
-        if low_stock:
-            df = pd.DataFrame([dict(i) for i in low_stock])
-            df_display = df[['product_name', 'brand', 'quantity', 'min_quantity', 'unit_measure', 'location']]
-            df_display.columns = ['Product', 'Brand', 'Current Qty', 'Min Qty', 'Unit', 'Location']
-            st.dataframe(df_display, use_container_width=True, hide_index=True)
-            
-            # Quick add to shopping list
-            if st.button("📝 Add All Low Stock Items to Shopping List"):
-                lists = db.get_user_shopping_lists(st.session_state.user_id)
-                active_lists = [l for l in lists if l['is_active']]
-                if active_lists:
-                    for item in low_stock:
-                        db.add_item_to_shopping_list(active_lists[0]['list_id'], item['product_id'], item['min_quantity'] - item['quantity'] + 1)
-                    st.success(f"Added {len(low_stock)} items to '{active_lists[0]['list_name']}'!")
-                else:
-                    list_id = db.create_shopping_list(st.session_state.user_id, "Restock List")
-                    for item in low_stock:
-                        db.add_item_to_shopping_list(list_id, item['product_id'], item['min_quantity'] - item['quantity'] + 1)
-                    st.success(f"Created 'Restock List' with {len(low_stock)} items!")
-                st.rerun()
-        else:
-            st.success("All items are well stocked! 🎉")
-        
-        # Out of Stock
-        st.markdown("### 🚫 Out of Stock Items")
-        out_of_stock = db.get_out_of_stock_items(st.session_state.user_id)
-        if out_of_stock:
-            df = pd.DataFrame([dict(i) for i in out_of_stock])
-            df_display = df[['product_name', 'brand', 'category_name', 'unit_price']]
-            df_display.columns = ['Product', 'Brand', 'Category', 'Price ($)']
-            st.dataframe(df_display, use_container_width=True, hide_index=True)
-        else:
-            st.success("Nothing is out of stock! 🎉")
+        _inventory_alerts_fragment(st.session_state.user_id)
 
 # ==================== MAIN APPLICATION ====================
 
@@ -932,6 +1245,8 @@ def main():
             
             st.divider()
             if st.button("🚪 Logout", use_container_width=True):
+                # Drop the cached dashboard and report data loaded for this user
+                _invalidate('orders')
                 st.session_state.logged_in = False
                 st.session_state.user_id = None
                 st.session_state.username = None
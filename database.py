@@ -6,24 +6,190 @@ Uses SQLite for data storage with all required entities:
 
 import sqlite3
 import hashlib
+import queue
+import random
+import threading
+import time
 from datetime import datetime
-from contextlib import contextmanager
+from contextlib import contextmanager, nullcontext
+from functools import wraps
+from operator import itemgetter
 
 DATABASE_PATH = "grocery_management.db"
 
-@contextmanager
-def get_connection():
-    """Context manager for database connections"""
-    conn = sqlite3.connect(DATABASE_PATH)
+# Number of rows per alert list shown on the dashboard
+ALERT_PREVIEW_LIMIT = 5
+
+# Number of most recent months plotted by the dashboard spending trend
+TREND_MONTHS = 24
+
+# Persistent pool of up to CONNECTION_POOL_SIZE connections shared by all threads;
+# a connection is checked out for the length of a get_connection() block and
+# reused by nested get_connection() calls on the same thread. WAL lets readers
+# run alongside a writer, and the write lock keeps a single thread at a time
+# inside a writing block
+CONNECTION_POOL_SIZE = 4
+_pool = queue.LifoQueue()
+_pool_lock = threading.Lock()
+_pool_opened = 0
+_local = threading.local()
+_write_lock = threading.RLock()
+
+# Size of sqlite3's per-connection prepared statement cache; every distinct SQL
+# string (including each optional-filter variant) stays prepared on each
+# pooled connection instead of being recompiled per call
+STATEMENT_CACHE_SIZE = 256
+
+# In-process query result caches (see cached_query): entries expire after
+# QUERY_CACHE_TTL seconds, so changes made by other processes are picked up, and
+# each cache holds at most REFERENCE_CACHE_SIZE entries; the writers below also
+# clear the affected caches after they commit
+QUERY_CACHE_TTL = 30
+REFERENCE_CACHE_SIZE = 1024
+_query_cache_lock = threading.Lock()
+
+# Upper bound on bound parameters per multi-row INSERT built by _bulk_insert;
+# 999 is SQLITE_MAX_VARIABLE_NUMBER on SQLite builds older than 3.32
+BULK_INSERT_MAX_PARAMS = 999
+
+def _open_connection():
+    """Open a connection and apply performance PRAGMAs"""
+    conn = sqlite3.connect(DATABASE_PATH, check_same_thread=False,
+                           cached_statements=STATEMENT_CACHE_SIZE)
     conn.row_factory = sqlite3.Row
+    conn.execute('PRAGMA journal_mode=WAL')
+    conn.execute('PRAGMA synchronous=NORMAL')
+    conn.execute('PRAGMA temp_store=MEMORY')
+    conn.execute('PRAGMA cache_size=-64000')
+    conn.execute('PRAGMA mmap_size=268435456')
+    return conn
+
+def _checkout_connection():
+    """Take an idle pooled connection, opening one while the pool is below its size"""
+    global _pool_opened
+    try:
+        return _pool.get_nowait()
+    except queue.Empty:
+        pass
+    with _pool_lock:
+        open_new = _pool_opened < CONNECTION_POOL_SIZE
+        if open_new:
+            _pool_opened += 1
+    if not open_new:
+        return _pool.get()
     try:
-        yield conn
+        return _open_connection()
+    except Exception:
+        with _pool_lock:
+            _pool_opened -= 1
+        raise
+
+@contextmanager
+def get_connection(write=False):
+    """Context manager for a pooled database connection (write=True serializes writers)"""
+    conn = getattr(_local, 'conn', None)
+    if conn is not None:
+        # Nested call: keep using the connection this thread already holds
+        with _write_lock if write else nullcontext():
+            try:
+                yield conn
+            except Exception:
+                conn.rollback()
+                raise
+        return
+    
+    # Check out before taking the write lock, so a writer never waits for a
+    # connection while holding the lock
+    conn = _checkout_connection()
+    _local.conn = conn
+    try:
+        with _write_lock if write else nullcontext():
+            try:
+                yield conn
+            except Exception:
+                conn.rollback()
+                raise
     finally:
-        conn.close()
+        _local.conn = None
+        if conn.in_transaction:
+            conn.rollback()
+        _pool.put(conn)
+
+def cached_query(ttl=QUERY_CACHE_TTL):
+    """Decorator caching a query function's results per argument tuple for ttl seconds"""
+    def decorator(func):
+        results = {}
+        state = {'generation': 0}
+        
+        @wraps(func)
+        def wrapper(*args):
+            now = time.monotonic()
+            with _query_cache_lock:
+                entry = results.get(args)
+                if entry is not None and now - entry[0] < ttl:
+                    return entry[1]
+                generation = state['generation']
+            value = func(*args)
+            with _query_cache_lock:
+                # Skip storing a result loaded before a cache_clear(), since it
+                # may predate the write that triggered the clear
+                if generation == state['generation']:
+                    if args not in results and len(results) >= REFERENCE_CACHE_SIZE:
+                        del results[next(iter(results))]
+                    results[args] = (now, value)
+            return value
+        
+        def cache_clear():
+            with _query_cache_lock:
+                state['generation'] += 1
+                results.clear()
+        
+        wrapper.cache_clear = cache_clear
+        return wrapper
+    return decorator
+
+# The helpers below fetch plain tuples (row_factory = None) and pair them with the
+# column names once, instead of building sqlite3.Row objects and looking every
+# column up by name
+
+def _rows(cursor):
+    """Materialize all result rows of a cursor as plain dicts"""
+    cursor.row_factory = None
+    names = [d[0] for d in cursor.description]
+    return [dict(zip(names, row)) for row in cursor.fetchall()]
+
+def _transpose(names, rows):
+    """Turn a list of row tuples into a {column: tuple of values} mapping"""
+    values = zip(*rows) if rows else [()] * len(names)
+    return dict(zip(names, values))
+
+def _columns(cursor):
+    """Materialize all result rows of a cursor as a {column: tuple of values} mapping"""
+    cursor.row_factory = None
+    names = [d[0] for d in cursor.description]
+    return _transpose(names, cursor.fetchall())
+
+def _row(cursor):
+    """Materialize the next result row of a cursor as a plain dict (or None)"""
+    cursor.row_factory = None
+    row = cursor.fetchone()
+    return dict(zip([d[0] for d in cursor.description], row)) if row is not None else None
+
+def _bulk_insert(cursor, table, columns, rows):
+    """Insert rows with multi-row INSERT statements of at most BULK_INSERT_MAX_PARAMS parameters"""
+    row_placeholders = '(' + ', '.join('?' * len(columns)) + ')'
+    chunk_size = max(1, BULK_INSERT_MAX_PARAMS // len(columns))
+    for start in range(0, len(rows), chunk_size):
+        chunk = rows[start:start + chunk_size]
+        cursor.execute(
+            f"INSERT INTO {table} ({', '.join(columns)}) VALUES "
+            + ', '.join([row_placeholders] * len(chunk)),
+            [value for row in chunk for value in row]
+        )
 
 def init_database():
     """Initialize the database with all required tables"""
-    with get_connection() as conn:
+    with get_connection(write=True) as conn:
         cursor = conn.cursor()
         
         # Users table - stores login and profile information
@@ -138,14 +304,77 @@ def init_database():
         
         # Create indexes for better query performance
         cursor.execute('CREATE INDEX IF NOT EXISTS idx_products_category ON products(category_id)')
-        cursor.execute('CREATE INDEX IF NOT EXISTS idx_orders_user ON orders(user_id)')
         cursor.execute('CREATE INDEX IF NOT EXISTS idx_orders_date ON orders(order_date)')
-        cursor.execute('CREATE INDEX IF NOT EXISTS idx_order_details_order ON order_details(order_id)')
         cursor.execute('CREATE INDEX IF NOT EXISTS idx_order_details_product ON order_details(product_id)')
+        
+        # Covering indexes for the analytics queries, which filter completed orders
+        # per user by date and aggregate their details; they replace the old
+        # single-column indexes on orders(user_id) and order_details(order_id)
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_orders_user_status_date ON orders(user_id, status, order_date, total_amount)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_order_details_order_product ON order_details(order_id, product_id, subtotal, quantity)')
+        cursor.execute('DROP INDEX IF EXISTS idx_orders_user')
+        cursor.execute('DROP INDEX IF EXISTS idx_order_details_order')
         cursor.execute('CREATE INDEX IF NOT EXISTS idx_inventory_user ON inventory(user_id)')
         cursor.execute('CREATE INDEX IF NOT EXISTS idx_inventory_expiry ON inventory(expiry_date)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_inventory_user_location ON inventory(user_id, location)')
+        
+        # One row per product per list; lets adding an item be a single UPSERT.
+        # Databases created before this index may hold duplicate rows, so fold
+        # their quantities into the oldest row and drop the rest first
+        cursor.execute('''
+            UPDATE shopping_list_items
+            SET quantity = (
+                SELECT SUM(dup.quantity) FROM shopping_list_items dup
+                WHERE dup.list_id = shopping_list_items.list_id
+                  AND dup.product_id = shopping_list_items.product_id
+            )
+            WHERE item_id IN (
+                SELECT MIN(item_id) FROM shopping_list_items
+                GROUP BY list_id, product_id HAVING COUNT(*) > 1
+            )
+        ''')
+        cursor.execute('''
+            DELETE FROM shopping_list_items
+            WHERE item_id NOT IN (
+                SELECT MIN(item_id) FROM shopping_list_items GROUP BY list_id, product_id
+            )
+        ''')
+        cursor.execute('CREATE UNIQUE INDEX IF NOT EXISTS idx_shopping_list_items_list_product ON shopping_list_items(list_id, product_id)')
+        
+        # Keep orders.total_amount equal to the sum of its detail subtotals
+        # incrementally (rounded to cents so repeated changes do not accumulate
+        # float error), instead of re-summing all details on every change
+        cursor.execute('''
+            CREATE TRIGGER IF NOT EXISTS trg_order_details_insert
+            AFTER INSERT ON order_details
+            BEGIN
+                UPDATE orders SET total_amount = ROUND(total_amount + NEW.subtotal, 2)
+                WHERE order_id = NEW.order_id;
+            END
+        ''')
+        cursor.execute('''
+            CREATE TRIGGER IF NOT EXISTS trg_order_details_delete
+            AFTER DELETE ON order_details
+            BEGIN
+                UPDATE orders SET total_amount = ROUND(total_amount - OLD.subtotal, 2)
+                WHERE order_id = OLD.order_id;
+            END
+        ''')
+        cursor.execute('''
+            CREATE TRIGGER IF NOT EXISTS trg_order_details_update
+            AFTER UPDATE OF order_id, subtotal ON order_details
+            BEGIN
+                UPDATE orders SET total_amount = ROUND(total_amount - OLD.subtotal, 2)
+                WHERE order_id = OLD.order_id;
+                UPDATE orders SET total_amount = ROUND(total_amount + NEW.subtotal, 2)
+                WHERE order_id = NEW.order_id;
+            END
+        ''')
         
         conn.commit()
+        
+        # Refresh planner statistics so the composite indexes get picked
+        cursor.execute('ANALYZE')
         print("Database initialized successfully!")
 
 def hash_password(password):
@@ -160,7 +389,7 @@ def verify_password(password, hashed):
 
 def create_user(username, email, password):
     """Create a new user"""
-    with get_connection() as conn:
+    with get_connection(write=True) as conn:
         cursor = conn.cursor()
         try:
             cursor.execute('''
@@ -168,6 +397,7 @@ def create_user(username, email, password):
                 VALUES (?, ?, ?)
             ''', (username, email, hash_password(password)))
             conn.commit()
+            _user_by_id.cache_clear()
             return cursor.lastrowid
         except sqlite3.IntegrityError as e:
             raise ValueError(f"User already exists: {e}")
@@ -177,21 +407,26 @@ def get_user_by_username(username):
     with get_connection() as conn:
         cursor = conn.cursor()
         cursor.execute('SELECT * FROM users WHERE username = ?', (username,))
-        return cursor.fetchone()
+        return _row(cursor)
 
-def get_user_by_id(user_id):
-    """Get user by ID"""
+@cached_query()
+def _user_by_id(user_id):
     with get_connection() as conn:
         cursor = conn.cursor()
         cursor.execute('SELECT * FROM users WHERE user_id = ?', (user_id,))
-        return cursor.fetchone()
+        return _row(cursor)
+
+def get_user_by_id(user_id):
+    """Get user by ID (cached; returns a copy)"""
+    user = _user_by_id(user_id)
+    return dict(user) if user is not None else None
 
 def get_all_users():
     """Get all users"""
     with get_connection() as conn:
         cursor = conn.cursor()
         cursor.execute('SELECT user_id, username, email, created_at FROM users')
-        return cursor.fetchall()
+        return _rows(cursor)
 
 def authenticate_user(username, password):
     """Authenticate user and return user data if valid"""
@@ -204,7 +439,7 @@ def authenticate_user(username, password):
 
 def create_category(category_name, description=None):
     """Create a new category"""
-    with get_connection() as conn:
+    with get_connection(write=True) as conn:
         cursor = conn.cursor()
         try:
             cursor.execute('''
@@ -212,99 +447,118 @@ def create_category(category_name, description=None):
                 VALUES (?, ?)
             ''', (category_name, description))
             conn.commit()
+            _clear_category_caches()
             return cursor.lastrowid
         except sqlite3.IntegrityError:
             raise ValueError(f"Category '{category_name}' already exists")
 
-def get_all_categories():
-    """Get all categories"""
+@cached_query()
+def _all_categories():
     with get_connection() as conn:
         cursor = conn.cursor()
         cursor.execute('SELECT * FROM categories ORDER BY category_name')
-        return cursor.fetchall()
+        return tuple(_rows(cursor))
 
-def get_category_by_id(category_id):
-    """Get category by ID"""
+@cached_query()
+def _category_by_id(category_id):
     with get_connection() as conn:
         cursor = conn.cursor()
         cursor.execute('SELECT * FROM categories WHERE category_id = ?', (category_id,))
-        return cursor.fetchone()
+        return _row(cursor)
+
+def _clear_category_caches():
+    """Drop cached categories and the category names cached with products"""
+    _all_categories.cache_clear()
+    _category_by_id.cache_clear()
+    _product_map.cache_clear()
+
+def get_all_categories():
+    """Get all categories (cached; returns copies)"""
+    return [dict(category) for category in _all_categories()]
+
+def get_category_by_id(category_id):
+    """Get category by ID (cached; returns a copy)"""
+    category = _category_by_id(category_id)
+    return dict(category) if category is not None else None
 
 def update_category(category_id, category_name, description):
     """Update category"""
-    with get_connection() as conn:
+    with get_connection(write=True) as conn:
         cursor = conn.cursor()
         cursor.execute('''
             UPDATE categories SET category_name = ?, description = ?
             WHERE category_id = ?
         ''', (category_name, description, category_id))
         conn.commit()
+        _clear_category_caches()
         return cursor.rowcount > 0
 
 def delete_category(category_id):
     """Delete category if no products are linked"""
-    with get_connection() as conn:
+    with get_connection(write=True) as conn:
         cursor = conn.cursor()
-        cursor.execute('SELECT COUNT(*) FROM products WHERE category_id = ?', (category_id,))
-        if cursor.fetchone()[0] > 0:
+        cursor.execute('SELECT 1 FROM products WHERE category_id = ? LIMIT 1', (category_id,))
+        if cursor.fetchone() is not None:
             raise ValueError("Cannot delete category with linked products")
         cursor.execute('DELETE FROM categories WHERE category_id = ?', (category_id,))
         conn.commit()
+        _clear_category_caches()
         return cursor.rowcount > 0
 
 # ==================== PRODUCT CRUD OPERATIONS ====================
 
 def create_product(product_name, category_id, unit_price, brand=None, unit_measure='unit'):
     """Create a new product"""
-    with get_connection() as conn:
+    with get_connection(write=True) as conn:
         cursor = conn.cursor()
         cursor.execute('''
             INSERT INTO products (product_name, category_id, brand, unit_price, unit_measure)
             VALUES (?, ?, ?, ?, ?)
         ''', (product_name, category_id, brand, unit_price, unit_measure))
         conn.commit()
+        _product_map.cache_clear()
         return cursor.lastrowid
 
-def get_all_products():
-    """Get all products with category information"""
+@cached_query()
+def _product_map():
+    """Load every product with its category name as a {product_id: row} mapping"""
     with get_connection() as conn:
         cursor = conn.cursor()
         cursor.execute('''
-            SELECT p.*, c.category_name 
+            SELECT p.product_id, p.product_name, p.category_id, p.brand,
+                   p.unit_price, p.unit_measure, c.category_name
             FROM products p
             JOIN categories c ON p.category_id = c.category_id
-            ORDER BY c.category_name, p.product_name
         ''')
-        return cursor.fetchall()
+        return {product['product_id']: product for product in _rows(cursor)}
+
+def get_all_products():
+    """Get all products with category information (cached; returns copies)"""
+    products = sorted(_product_map().values(), key=itemgetter('category_name', 'product_name'))
+    return [dict(product) for product in products]
 
 def get_products_by_category(category_id):
     """Get products by category"""
     with get_connection() as conn:
         cursor = conn.cursor()
         cursor.execute('''
-            SELECT p.*, c.category_name 
+            SELECT p.product_id, p.product_name, p.category_id, p.brand,
+                   p.unit_price, p.unit_measure, c.category_name
             FROM products p
             JOIN categories c ON p.category_id = c.category_id
             WHERE p.category_id = ?
             ORDER BY p.product_name
         ''', (category_id,))
-        return cursor.fetchall()
+        return _rows(cursor)
 
 def get_product_by_id(product_id):
-    """Get product by ID"""
-    with get_connection() as conn:
-        cursor = conn.cursor()
-        cursor.execute('''
-            SELECT p.*, c.category_name 
-            FROM products p
-            JOIN categories c ON p.category_id = c.category_id
-            WHERE p.product_id = ?
-        ''', (product_id,))
-        return cursor.fetchone()
+    """Get product by ID (cached; returns a copy)"""
+    product = _product_map().get(product_id)
+    return dict(product) if product is not None else None
 
 def update_product(product_id, product_name, category_id, unit_price, brand, unit_measure):
     """Update product"""
-    with get_connection() as conn:
+    with get_connection(write=True) as conn:
         cursor = conn.cursor()
         cursor.execute('''
             UPDATE products 
@@ -313,14 +567,16 @@ def update_product(product_id, product_name, category_id, unit_price, brand, uni
             WHERE product_id = ?
         ''', (product_name, category_id, unit_price, brand, unit_measure, product_id))
         conn.commit()
+        _product_map.cache_clear()
         return cursor.rowcount > 0
 
 def delete_product(product_id):
     """Delete product"""
-    with get_connection() as conn:
+    with get_connection(write=True) as conn:
         cursor = conn.cursor()
         cursor.execute('DELETE FROM products WHERE product_id = ?', (product_id,))
         conn.commit()
+        _product_map.cache_clear()
         return cursor.rowcount > 0
 
 def search_products(search_term):
@@ -329,19 +585,51 @@ def search_products(search_term):
         cursor = conn.cursor()
         search_pattern = f'%{search_term}%'
         cursor.execute('''
-            SELECT p.*, c.category_name 
+            SELECT p.product_id, p.product_name, p.category_id, p.brand,
+                   p.unit_price, p.unit_measure, c.category_name
             FROM products p
             JOIN categories c ON p.category_id = c.category_id
             WHERE p.product_name LIKE ? OR p.brand LIKE ?
             ORDER BY p.product_name
         ''', (search_pattern, search_pattern))
-        return cursor.fetchall()
+        return _rows(cursor)
+
+def get_products_for_browse(search_term=None, category_id=None, limit=None, offset=0):
+    """Get a page of product browser columns filtered by search term and category (total_count holds the unpaged count)"""
+    with get_connection() as conn:
+        cursor = conn.cursor()
+        query = '''
+            SELECT p.product_id, p.product_name, p.brand, c.category_name,
+                   p.unit_price, p.unit_measure,
+                   COUNT(*) OVER () as total_count
+            FROM products p
+            JOIN categories c ON p.category_id = c.category_id
+            WHERE 1 = 1
+        '''
+        params = []
+        
+        if search_term:
+            query += ' AND (p.product_name LIKE ? OR p.brand LIKE ?)'
+            search_pattern = f'%{search_term}%'
+            params.extend([search_pattern, search_pattern])
+        if category_id is not None:
+            query += ' AND p.category_id = ?'
+            params.append(category_id)
+        
+        query += ' ORDER BY c.category_name, p.product_name'
+        
+        if limit is not None:
+            query += ' LIMIT ? OFFSET ?'
+            params.extend([limit, offset])
+        
+        cursor.execute(query, params)
+        return _rows(cursor)
 
 # ==================== ORDER CRUD OPERATIONS ====================
 
 def create_order(user_id):
     """Create a new order"""
-    with get_connection() as conn:
+    with get_connection(write=True) as conn:
         cursor = conn.cursor()
         cursor.execute('''
             INSERT INTO orders (user_id, status)
@@ -352,35 +640,23 @@ def create_order(user_id):
 
 def add_order_detail(order_id, product_id, quantity):
     """Add item to order"""
-    with get_connection() as conn:
+    with get_connection(write=True) as conn:
         cursor = conn.cursor()
-        # Get product price
-        cursor.execute('SELECT unit_price FROM products WHERE product_id = ?', (product_id,))
-        product = cursor.fetchone()
-        if not product:
-            raise ValueError("Product not found")
-        
-        unit_price = product['unit_price']
-        subtotal = unit_price * quantity
-        
+        # Price the item from the products table as part of the insert
         cursor.execute('''
             INSERT INTO order_details (order_id, product_id, quantity, unit_price, subtotal)
-            VALUES (?, ?, ?, ?, ?)
-        ''', (order_id, product_id, quantity, unit_price, subtotal))
-        
-        # Update order total
-        cursor.execute('''
-            UPDATE orders SET total_amount = (
-                SELECT SUM(subtotal) FROM order_details WHERE order_id = ?
-            ) WHERE order_id = ?
-        ''', (order_id, order_id))
+            SELECT ?, product_id, ?, unit_price, unit_price * ?
+            FROM products WHERE product_id = ?
+        ''', (order_id, quantity, quantity, product_id))
+        if cursor.rowcount == 0:
+            raise ValueError("Product not found")
         
         conn.commit()
         return cursor.lastrowid
 
 def complete_order(order_id):
     """Mark order as completed"""
-    with get_connection() as conn:
+    with get_connection(write=True) as conn:
         cursor = conn.cursor()
         cursor.execute('''
             UPDATE orders SET status = 'completed' WHERE order_id = ?
@@ -393,35 +669,46 @@ def get_user_orders(user_id):
     with get_connection() as conn:
         cursor = conn.cursor()
         cursor.execute('''
-            SELECT * FROM orders 
+            SELECT *,
+                   strftime('%Y-%m-%d %H:%M', COALESCE(order_date, 'now')) as order_date_display
+            FROM orders 
             WHERE user_id = ? 
             ORDER BY order_date DESC
         ''', (user_id,))
-        return cursor.fetchall()
+        return _rows(cursor)
 
 def get_order_details(order_id):
-    """Get all items in an order"""
+    """Get all items in an order, with product fields joined from the cached product map"""
     with get_connection() as conn:
         cursor = conn.cursor()
         cursor.execute('''
-            SELECT od.*, p.product_name, p.brand, c.category_name
-            FROM order_details od
-            JOIN products p ON od.product_id = p.product_id
-            JOIN categories c ON p.category_id = c.category_id
-            WHERE od.order_id = ?
+            SELECT detail_id, order_id, product_id, quantity, unit_price, subtotal
+            FROM order_details WHERE order_id = ? ORDER BY detail_id
         ''', (order_id,))
-        return cursor.fetchall()
+        details = _rows(cursor)
+    
+    products = _product_map()
+    rows = []
+    for detail in details:
+        product = products.get(detail['product_id'])
+        if product is None:
+            continue
+        detail['product_name'] = product['product_name']
+        detail['brand'] = product['brand']
+        detail['category_name'] = product['category_name']
+        rows.append(detail)
+    return rows
 
 def get_order_by_id(order_id):
     """Get order by ID"""
     with get_connection() as conn:
         cursor = conn.cursor()
         cursor.execute('SELECT * FROM orders WHERE order_id = ?', (order_id,))
-        return cursor.fetchone()
+        return _row(cursor)
 
 def delete_order(order_id):
     """Delete an order"""
-    with get_connection() as conn:
+    with get_connection(write=True) as conn:
         cursor = conn.cursor()
         cursor.execute('DELETE FROM orders WHERE order_id = ?', (order_id,))
         conn.commit()
@@ -431,7 +718,7 @@ def delete_order(order_id):
 
 def create_shopping_list(user_id, list_name):
     """Create a new shopping list"""
-    with get_connection() as conn:
+    with get_connection(write=True) as conn:
         cursor = conn.cursor()
         cursor.execute('''
             INSERT INTO shopping_lists (user_id, list_name)
@@ -454,52 +741,76 @@ def get_user_shopping_lists(user_id):
             GROUP BY sl.list_id
             ORDER BY sl.created_at DESC
         ''', (user_id,))
-        return cursor.fetchall()
+        return _rows(cursor)
 
 def add_item_to_shopping_list(list_id, product_id, quantity=1):
     """Add item to shopping list"""
-    with get_connection() as conn:
+    with get_connection(write=True) as conn:
         cursor = conn.cursor()
-        # Check if item already exists in list
+        # Insert the item, or top up its quantity if it is already on the list
         cursor.execute('''
-            SELECT item_id FROM shopping_list_items 
-            WHERE list_id = ? AND product_id = ?
-        ''', (list_id, product_id))
-        existing = cursor.fetchone()
-        
-        if existing:
-            cursor.execute('''
-                UPDATE shopping_list_items 
-                SET quantity = quantity + ?
-                WHERE list_id = ? AND product_id = ?
-            ''', (quantity, list_id, product_id))
-        else:
-            cursor.execute('''
-                INSERT INTO shopping_list_items (list_id, product_id, quantity)
-                VALUES (?, ?, ?)
-            ''', (list_id, product_id, quantity))
-        
+            INSERT INTO shopping_list_items (list_id, product_id, quantity)
+            VALUES (?, ?, ?)
+            ON CONFLICT (list_id, product_id) DO UPDATE SET quantity = quantity + excluded.quantity
+        ''', (list_id, product_id, quantity))
         conn.commit()
         return cursor.lastrowid
 
+def add_items_to_shopping_list(list_id, items):
+    """Add several (product_id, quantity) pairs to a shopping list in one transaction"""
+    quantities = {}
+    for product_id, quantity in items:
+        quantities[product_id] = quantities.get(product_id, 0) + quantity
+    if not quantities:
+        return 0
+    
+    with get_connection(write=True) as conn:
+        cursor = conn.cursor()
+        # Insert new products and top up those already on the list
+        cursor.executemany('''
+            INSERT INTO shopping_list_items (list_id, product_id, quantity)
+            VALUES (?, ?, ?)
+            ON CONFLICT (list_id, product_id) DO UPDATE SET quantity = quantity + excluded.quantity
+        ''', [(list_id, product_id, quantity) for product_id, quantity in quantities.items()])
+        conn.commit()
+        return len(quantities)
+
 def get_shopping_list_items(list_id):
-    """Get all items in a shopping list"""
+    """Get all items in a shopping list (list_total holds the estimated total of the whole list)"""
     with get_connection() as conn:
         cursor = conn.cursor()
         cursor.execute('''
-            SELECT sli.*, p.product_name, p.brand, p.unit_price, 
-                   p.unit_measure, c.category_name
-            FROM shopping_list_items sli
-            JOIN products p ON sli.product_id = p.product_id
-            JOIN categories c ON p.category_id = c.category_id
-            WHERE sli.list_id = ?
-            ORDER BY c.category_name, p.product_name
+            SELECT item_id, list_id, product_id, quantity, is_purchased
+            FROM shopping_list_items WHERE list_id = ?
         ''', (list_id,))
-        return cursor.fetchall()
+        list_items = _rows(cursor)
+    
+    # Join product fields from the cached product map instead of in SQL
+    products = _product_map()
+    items = []
+    for item in list_items:
+        product = products.get(item['product_id'])
+        if product is None:
+            continue
+        item['product_name'] = product['product_name']
+        item['brand'] = product['brand']
+        item['unit_price'] = product['unit_price']
+        item['unit_measure'] = product['unit_measure']
+        item['category_name'] = product['category_name']
+        item['subtotal'] = product['unit_price'] * item['quantity']
+        items.append(item)
+    
+    items.sort(key=lambda item: (item['category_name'], item['product_name']))
+    # This is the only definition of a list's estimated total: the sum of the
+    # subtotals of items whose product still exists
+    list_total = sum(item['subtotal'] for item in items)
+    for item in items:
+        item['list_total'] = list_total
+    return items
 
 def toggle_shopping_list_item(item_id):
     """Toggle purchased status of shopping list item"""
-    with get_connection() as conn:
+    with get_connection(write=True) as conn:
         cursor = conn.cursor()
         cursor.execute('''
             UPDATE shopping_list_items 
@@ -509,33 +820,66 @@ def toggle_shopping_list_item(item_id):
         conn.commit()
         return cursor.rowcount > 0
 
+def set_items_purchased(changes):
+    """Set the purchased status of several shopping list items from (item_id, is_purchased) pairs"""
+    if not changes:
+        return 0
+    with get_connection(write=True) as conn:
+        cursor = conn.cursor()
+        cursor.executemany('''
+            UPDATE shopping_list_items SET is_purchased = ? WHERE item_id = ?
+        ''', [(int(is_purchased), item_id) for item_id, is_purchased in changes])
+        conn.commit()
+        return len(changes)
+
 def delete_shopping_list(list_id):
     """Delete a shopping list"""
-    with get_connection() as conn:
+    with get_connection(write=True) as conn:
         cursor = conn.cursor()
         cursor.execute('DELETE FROM shopping_lists WHERE list_id = ?', (list_id,))
         conn.commit()
         return cursor.rowcount > 0
 
 def convert_shopping_list_to_order(list_id, user_id):
-    """Convert a shopping list to an order"""
-    with get_connection() as conn:
+    """Convert a shopping list to a completed order in a single transaction"""
+    with get_connection(write=True) as conn:
         cursor = conn.cursor()
         
-        # Get all items from the shopping list
-        items = get_shopping_list_items(list_id)
-        if not items:
+        # Only items whose product (and its category) still exists are copied
+        # below, so check for those rather than for any list row
+        cursor.execute('''
+            SELECT 1
+            FROM shopping_list_items sli
+            JOIN products p ON sli.product_id = p.product_id
+            JOIN categories c ON p.category_id = c.category_id
+            WHERE sli.list_id = ?
+            LIMIT 1
+        ''', (list_id,))
+        if cursor.fetchone() is None:
             raise ValueError("Shopping list is empty")
         
         # Create new order
-        order_id = create_order(user_id)
+        cursor.execute('''
+            INSERT INTO orders (user_id, status)
+            VALUES (?, 'pending')
+        ''', (user_id,))
+        order_id = cursor.lastrowid
         
-        # Add each item to the order
-        for item in items:
-            add_order_detail(order_id, item['product_id'], item['quantity'])
+        # Copy every list item into the order at the current product prices
+        cursor.execute('''
+            INSERT INTO order_details (order_id, product_id, quantity, unit_price, subtotal)
+            SELECT ?, sli.product_id, sli.quantity, p.unit_price, p.unit_price * sli.quantity
+            FROM shopping_list_items sli
+            JOIN products p ON sli.product_id = p.product_id
+            JOIN categories c ON p.category_id = c.category_id
+            WHERE sli.list_id = ?
+            ORDER BY c.category_name, p.product_name
+        ''', (order_id, list_id))
         
-        # Complete the order
-        complete_order(order_id)
+        # Complete the order (the order_details triggers have set its total)
+        cursor.execute('''
+            UPDATE orders SET status = 'completed' WHERE order_id = ?
+        ''', (order_id,))
         
         # Mark shopping list as inactive
         cursor.execute('''
@@ -570,10 +914,10 @@ def get_spending_by_category(user_id, start_date=None, end_date=None):
         
         query += ' GROUP BY c.category_id ORDER BY total_spent DESC'
         cursor.execute(query, params)
-        return cursor.fetchall()
+        return _rows(cursor)
 
-def get_monthly_spending(user_id, year=None):
-    """Get monthly spending for a user"""
+def get_monthly_spending(user_id, year=None, months=None):
+    """Get monthly spending for a user as columns (month, total_spent, order_count)"""
     with get_connection() as conn:
         cursor = conn.cursor()
         query = '''
@@ -589,9 +933,14 @@ def get_monthly_spending(user_id, year=None):
             query += " AND strftime('%Y', order_date) = ?"
             params.append(str(year))
         
+        if months:
+            # Current month plus the (months - 1) before it
+            query += " AND order_date >= date('now', 'start of month', '-' || ? || ' months')"
+            params.append(months - 1)
+        
         query += ' GROUP BY month ORDER BY month'
         cursor.execute(query, params)
-        return cursor.fetchall()
+        return _columns(cursor)
 
 def get_most_purchased_products(user_id, limit=10):
     """Get most frequently purchased products"""
@@ -610,10 +959,10 @@ def get_most_purchased_products(user_id, limit=10):
             ORDER BY total_quantity DESC
             LIMIT ?
         ''', (user_id, limit))
-        return cursor.fetchall()
+        return _rows(cursor)
 
 def get_weekly_spending(user_id):
-    """Get spending for the last 7 days"""
+    """Get spending for the last 7 days as columns (day, daily_total)"""
     with get_connection() as conn:
         cursor = conn.cursor()
         cursor.execute('''
@@ -626,7 +975,7 @@ def get_weekly_spending(user_id):
             GROUP BY day
             ORDER BY day
         ''', (user_id,))
-        return cursor.fetchall()
+        return _columns(cursor)
 
 def get_total_spending(user_id):
     """Get total spending for a user"""
@@ -634,17 +983,86 @@ def get_total_spending(user_id):
         cursor = conn.cursor()
         cursor.execute('''
             SELECT SUM(total_amount) as total_spent,
-                   COUNT(*) as total_orders
+                   COUNT(*) as total_orders,
+                   AVG(total_amount) as avg_order
             FROM orders
             WHERE user_id = ? AND status = 'completed'
         ''', (user_id,))
-        return cursor.fetchone()
+        return _row(cursor)
+
+def get_dashboard_bundle(user_id):
+    """Get all dashboard data using one connection and one read transaction"""
+    with get_connection() as conn:
+        conn.execute('BEGIN')
+        try:
+            return {
+                'spending': get_total_spending(user_id),
+                'inventory_summary': get_inventory_summary(user_id),
+                'expiring': get_expiring_soon(user_id, days=7, limit=ALERT_PREVIEW_LIMIT),
+                'expired': get_expired_items(user_id, limit=ALERT_PREVIEW_LIMIT),
+                'low_stock': get_low_stock_items(user_id, limit=ALERT_PREVIEW_LIMIT),
+                'out_of_stock': get_out_of_stock_items(user_id, limit=ALERT_PREVIEW_LIMIT),
+                'inv_by_location': get_inventory_by_location(user_id),
+                'inv_by_category': get_inventory_by_category(user_id),
+                'spending_by_category': get_spending_by_category(user_id),
+                'monthly_spending': get_monthly_spending(user_id, months=TREND_MONTHS),
+                'top_products': get_most_purchased_products(user_id, limit=5),
+                'suggestions': get_suggested_products(user_id, limit=5),
+            }
+        finally:
+            conn.commit()
+
+def get_reports_bundle(user_id, start_date=None, end_date=None):
+    """Get spending by category (within the date range), by month and for the last 7 days in one query"""
+    with get_connection() as conn:
+        cursor = conn.cursor()
+        # One scan of the user's completed orders feeds all three aggregates
+        cursor.execute('''
+            WITH user_orders AS (
+                SELECT order_id, order_date, total_amount
+                FROM orders
+                WHERE user_id = ? AND status = 'completed'
+            )
+            SELECT 'month' as metric, strftime('%Y-%m', order_date) as label,
+                   SUM(total_amount) as total, COUNT(*) as order_count
+            FROM user_orders
+            GROUP BY strftime('%Y-%m', order_date)
+            UNION ALL
+            SELECT 'day', date(order_date), SUM(total_amount), COUNT(*)
+            FROM user_orders
+            WHERE order_date >= date('now', '-7 days')
+            GROUP BY date(order_date)
+            UNION ALL
+            SELECT 'category', c.category_name, SUM(od.subtotal), NULL
+            FROM user_orders o
+            JOIN order_details od ON o.order_id = od.order_id
+            JOIN products p ON od.product_id = p.product_id
+            JOIN categories c ON p.category_id = c.category_id
+            WHERE (? IS NULL OR o.order_date >= ?)
+              AND (? IS NULL OR o.order_date <= ?)
+            GROUP BY c.category_id
+        ''', (user_id, start_date, start_date, end_date, end_date))
+        cursor.row_factory = None
+        rows = cursor.fetchall()
+    
+    months = sorted(((label, total, count) for metric, label, total, count in rows if metric == 'month'),
+                    key=lambda row: row[0] or '')
+    days = sorted(((label, total) for metric, label, total, _ in rows if metric == 'day'),
+                  key=lambda row: row[0] or '')
+    categories = sorted(({'category_name': label, 'total_spent': total}
+                         for metric, label, total, _ in rows if metric == 'category'),
+                        key=lambda row: row['total_spent'], reverse=True)
+    return {
+        'spending_by_category': categories,
+        'monthly_spending': _transpose(('month', 'total_spent', 'order_count'), months),
+        'weekly_spending': _transpose(('day', 'daily_total'), days),
+    }
 
 # ==================== INVENTORY OPERATIONS ====================
 
 def add_to_inventory(user_id, product_id, quantity, expiry_date=None, location='Pantry', min_quantity=2, notes=None):
     """Add item to inventory"""
-    with get_connection() as conn:
+    with get_connection(write=True) as conn:
         cursor = conn.cursor()
         # Check if product already exists in inventory
         cursor.execute('''
@@ -669,27 +1087,37 @@ def add_to_inventory(user_id, product_id, quantity, expiry_date=None, location='
         conn.commit()
         return cursor.lastrowid
 
-def get_user_inventory(user_id):
-    """Get all inventory items for a user"""
+def get_user_inventory(user_id, name_like=None, location=None):
+    """Get inventory items for a user, optionally filtered by product name and location"""
     with get_connection() as conn:
         cursor = conn.cursor()
-        cursor.execute('''
+        query = '''
             SELECT i.*, p.product_name, p.brand, p.unit_measure, c.category_name
             FROM inventory i
             JOIN products p ON i.product_id = p.product_id
             JOIN categories c ON p.category_id = c.category_id
             WHERE i.user_id = ? AND i.quantity > 0
-            ORDER BY c.category_name, p.product_name
-        ''', (user_id,))
-        return cursor.fetchall()
+        '''
+        params = [user_id]
+        if name_like:
+            escaped = name_like.lower().replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+            query += " AND lower(p.product_name) LIKE ? ESCAPE '\\'"
+            params.append(f"%{escaped}%")
+        if location:
+            query += ' AND i.location = ?'
+            params.append(location)
+        query += ' ORDER BY c.category_name, p.product_name'
+        cursor.execute(query, params)
+        return _rows(cursor)
 
-def get_expiring_soon(user_id, days=7):
-    """Get items expiring within specified days"""
+def get_expiring_soon(user_id, days=7, limit=None):
+    """Get items expiring within specified days (total_count holds the unlimited count)"""
     with get_connection() as conn:
         cursor = conn.cursor()
-        cursor.execute('''
+        query = '''
             SELECT i.*, p.product_name, p.brand, p.unit_measure, c.category_name,
-                   julianday(i.expiry_date) - julianday('now') as days_until_expiry
+                   julianday(i.expiry_date) - julianday('now') as days_until_expiry,
+                   COUNT(*) OVER () as total_count
             FROM inventory i
             JOIN products p ON i.product_id = p.product_id
             JOIN categories c ON p.category_id = c.category_id
@@ -699,16 +1127,24 @@ def get_expiring_soon(user_id, days=7):
               AND i.expiry_date <= date('now', '+' || ? || ' days')
               AND i.expiry_date >= date('now')
             ORDER BY i.expiry_date ASC
-        ''', (user_id, days))
-        return cursor.fetchall()
+        '''
+        params = [user_id, days]
+        
+        if limit is not None:
+            query += ' LIMIT ?'
+            params.append(limit)
+        
+        cursor.execute(query, params)
+        return _rows(cursor)
 
-def get_expired_items(user_id):
-    """Get items that have already expired"""
+def get_expired_items(user_id, limit=None):
+    """Get items that have already expired (total_count holds the unlimited count)"""
     with get_connection() as conn:
         cursor = conn.cursor()
-        cursor.execute('''
+        query = '''
             SELECT i.*, p.product_name, p.brand, p.unit_measure, c.category_name,
-                   julianday('now') - julianday(i.expiry_date) as days_expired
+                   julianday('now') - julianday(i.expiry_date) as days_expired,
+                   COUNT(*) OVER () as total_count
             FROM inventory i
             JOIN products p ON i.product_id = p.product_id
             JOIN categories c ON p.category_id = c.category_id
@@ -717,15 +1153,23 @@ def get_expired_items(user_id):
               AND i.expiry_date IS NOT NULL
               AND i.expiry_date < date('now')
             ORDER BY i.expiry_date ASC
-        ''', (user_id,))
-        return cursor.fetchall()
+        '''
+        params = [user_id]
+        
+        if limit is not None:
+            query += ' LIMIT ?'
+            params.append(limit)
+        
+        cursor.execute(query, params)
+        return _rows(cursor)
 
-def get_low_stock_items(user_id):
+def get_low_stock_items(user_id, limit=None):
     """Get items that are running low (quantity <= min_quantity)"""
     with get_connection() as conn:
         cursor = conn.cursor()
-        cursor.execute('''
-            SELECT i.*, p.product_name, p.brand, p.unit_measure, p.unit_price, c.category_name
+        query = '''
+            SELECT i.*, p.product_name, p.brand, p.unit_measure, p.unit_price, c.category_name,
+                   COUNT(*) OVER () as total_count
             FROM inventory i
             JOIN products p ON i.product_id = p.product_id
             JOIN categories c ON p.category_id = c.category_id
@@ -733,26 +1177,41 @@ def get_low_stock_items(user_id):
               AND i.quantity <= i.min_quantity
               AND i.quantity > 0
             ORDER BY i.quantity ASC
-        ''', (user_id,))
-        return cursor.fetchall()
+        '''
+        params = [user_id]
+        
+        if limit is not None:
+            query += ' LIMIT ?'
+            params.append(limit)
+        
+        cursor.execute(query, params)
+        return _rows(cursor)
 
-def get_out_of_stock_items(user_id):
+def get_out_of_stock_items(user_id, limit=None):
     """Get items that are out of stock (quantity = 0)"""
     with get_connection() as conn:
         cursor = conn.cursor()
-        cursor.execute('''
-            SELECT i.*, p.product_name, p.brand, p.unit_measure, p.unit_price, c.category_name
+        query = '''
+            SELECT i.*, p.product_name, p.brand, p.unit_measure, p.unit_price, c.category_name,
+                   COUNT(*) OVER () as total_count
             FROM inventory i
             JOIN products p ON i.product_id = p.product_id
             JOIN categories c ON p.category_id = c.category_id
             WHERE i.user_id = ? AND i.quantity = 0
             ORDER BY p.product_name
-        ''', (user_id,))
-        return cursor.fetchall()
+        '''
+        params = [user_id]
+        
+        if limit is not None:
+            query += ' LIMIT ?'
+            params.append(limit)
+        
+        cursor.execute(query, params)
+        return _rows(cursor)
 
 def update_inventory_quantity(inventory_id, quantity):
     """Update inventory quantity"""
-    with get_connection() as conn:
+    with get_connection(write=True) as conn:
         cursor = conn.cursor()
         cursor.execute('''
             UPDATE inventory SET quantity = ? WHERE inventory_id = ?
@@ -762,7 +1221,7 @@ def update_inventory_quantity(inventory_id, quantity):
 
 def update_inventory_item(inventory_id, quantity, min_quantity, expiry_date, location, notes):
     """Update inventory item details"""
-    with get_connection() as conn:
+    with get_connection(write=True) as conn:
         cursor = conn.cursor()
         cursor.execute('''
             UPDATE inventory 
@@ -774,7 +1233,7 @@ def update_inventory_item(inventory_id, quantity, min_quantity, expiry_date, loc
 
 def delete_inventory_item(inventory_id):
     """Delete inventory item"""
-    with get_connection() as conn:
+    with get_connection(write=True) as conn:
         cursor = conn.cursor()
         cursor.execute('DELETE FROM inventory WHERE inventory_id = ?', (inventory_id,))
         conn.commit()
@@ -782,7 +1241,7 @@ def delete_inventory_item(inventory_id):
 
 def use_inventory_item(inventory_id, quantity_used):
     """Decrease inventory quantity when item is used"""
-    with get_connection() as conn:
+    with get_connection(write=True) as conn:
         cursor = conn.cursor()
         cursor.execute('''
             UPDATE inventory 
@@ -807,7 +1266,26 @@ def get_inventory_summary(user_id):
             FROM inventory
             WHERE user_id = ?
         ''', (user_id,))
-        return cursor.fetchone()
+        return _row(cursor)
+
+def get_inventory_alert_rows(user_id):
+    """Get every inventory row for a user with the expiry columns the alert views need"""
+    with get_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute('''
+            SELECT i.*, p.product_name, p.brand, p.unit_measure, p.unit_price, c.category_name,
+                   CAST(julianday(i.expiry_date) - julianday('now') AS INTEGER) as days_until_expiry,
+                   CAST(julianday('now') - julianday(i.expiry_date) AS INTEGER) as days_expired,
+                   i.quantity <= i.min_quantity AND i.quantity > 0 as is_low_stock,
+                   i.expiry_date < date('now') as is_expired,
+                   i.expiry_date >= date('now') AND i.expiry_date <= date('now', '+7 days') as is_expiring_soon
+            FROM inventory i
+            JOIN products p ON i.product_id = p.product_id
+            JOIN categories c ON p.category_id = c.category_id
+            WHERE i.user_id = ?
+            ORDER BY p.product_name
+        ''', (user_id,))
+        return _rows(cursor)
 
 def get_inventory_by_location(user_id):
     """Get inventory grouped by location"""
@@ -820,7 +1298,7 @@ def get_inventory_by_location(user_id):
             GROUP BY location
             ORDER BY item_count DESC
         ''', (user_id,))
-        return cursor.fetchall()
+        return _rows(cursor)
 
 def get_inventory_by_category(user_id):
     """Get inventory grouped by category"""
@@ -835,7 +1313,7 @@ def get_inventory_by_category(user_id):
             GROUP BY c.category_id
             ORDER BY item_count DESC
         ''', (user_id,))
-        return cursor.fetchall()
+        return _rows(cursor)
 
 def get_suggested_products(user_id, limit=5):
     """Get suggested products based on purchase history"""
@@ -859,29 +1337,35 @@ def get_suggested_products(user_id, limit=5):
                 JOIN order_details od ON o.order_id = od.order_id
                 WHERE o.user_id = ? AND o.order_date >= date('now', '-30 days')
             )
-            SELECT p.*, c.category_name
+            SELECT p.product_id
             FROM products p
-            JOIN categories c ON p.category_id = c.category_id
             WHERE p.category_id IN (SELECT category_id FROM UserCategories)
               AND p.product_id NOT IN (SELECT product_id FROM RecentProducts)
-            ORDER BY RANDOM()
-            LIMIT ?
-        ''', (user_id, user_id, limit))
-        return cursor.fetchall()
+        ''', (user_id, user_id))
+        candidate_ids = [row[0] for row in cursor.fetchall()]
+    
+    # Sample the candidates in Python instead of sorting them all by RANDOM()
+    products = _product_map()
+    candidate_ids = [product_id for product_id in candidate_ids if product_id in products]
+    picked = random.sample(candidate_ids, min(limit, len(candidate_ids)))
+    return [dict(products[product_id]) for product_id in picked]
 
 # ==================== SAMPLE DATA ====================
 
 def insert_sample_data():
     """Insert sample data for testing"""
-    with get_connection() as conn:
+    with get_connection(write=True) as conn:
         cursor = conn.cursor()
         
         # Check if data already exists
-        cursor.execute('SELECT COUNT(*) FROM categories')
-        if cursor.fetchone()[0] > 0:
+        cursor.execute('SELECT 1 FROM categories LIMIT 1')
+        if cursor.fetchone() is not None:
             print("Sample data already exists!")
             return
         
+        # Seed everything in one transaction
+        cursor.execute('BEGIN')
+        
         # Insert categories
         categories = [
             ('Dairy', 'Milk, cheese, yogurt, and other dairy products'),
@@ -895,9 +1379,7 @@ def insert_sample_data():
             ('Household', 'Cleaning supplies and household items'),
             ('Personal Care', 'Hygiene and personal care products')
         ]
-        cursor.executemany('''
-            INSERT INTO categories (category_name, description) VALUES (?, ?)
-        ''', categories)
+        _bulk_insert(cursor, 'categories', ('category_name', 'description'), categories)
         
         # Insert products
         products = [
@@ -962,10 +1444,9 @@ def insert_sample_data():
             ('Deodorant', 10, 'Old Spice', 6.49, 'stick'),
             ('Hand Soap', 10, 'Softsoap', 3.99, 'bottle')
         ]
-        cursor.executemany('''
-            INSERT INTO products (product_name, category_id, brand, unit_price, unit_measure)
-            VALUES (?, ?, ?, ?, ?)
-        ''', products)
+        _bulk_insert(cursor, 'products',
+                     ('product_name', 'category_id', 'brand', 'unit_price', 'unit_measure'),
+                     products)
         
         # Create sample user
         cursor.execute('''
@@ -974,6 +1455,8 @@ def insert_sample_data():
         ''', ('demo_user', 'demo@example.com', hash_password('password123')))
         
         conn.commit()
+        _clear_category_caches()
+        _user_by_id.cache_clear()
         print("Sample data inserted successfully!")
 
 if __name__ == '__main__':